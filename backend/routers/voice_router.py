@@ -199,7 +199,7 @@ async def upload_kb_document(
         supabase = get_supabase()
 
         import hashlib
-        content_hash = hashlib.sha256(content_text.encode()).hexdigest()
+        content_hash = hashlib.sha256(content).hexdigest()
 
         result = supabase.table('kb_documents').insert({
             'user_id': 'anonymous',
@@ -1,8 +1,10 @@
+import copy
+import hashlib
 import json
 import os
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 from pathlib import Path
-import tempfile
 import zipfile
 
 
@@ -43,35 +45,109 @@ class FolderParser:
         return result
 
     def parse_zip(self, zip_path: str) -> Dict:
-        """Parse a zipped .codex or .claude folder"""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-
-            extracted_folders = os.listdir(temp_dir)
-            if len(extracted_folders) == 1:
-                folder_path = os.path.join(temp_dir, extracted_folders[0])
-            else:
-                folder_path = temp_dir
+        """Parse a zipped .codex or .claude folder without extracting it to disk"""
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            entries = [info for info in zip_ref.infolist() if not info.is_dir()]
+
+            top_level = {self._zip_parts(info.filename)[0] for info in zip_ref.infolist()}
+            root = None
+            if len(top_level) == 1:
+                candidate = next(iter(top_level))
+                if any(len(self._zip_parts(info.filename)) > 1 for info in entries):
+                    root = candidate
+
+            result = {
+                'folder_type': self._detect_folder_type(root or ''),
+                'structure': self._build_zip_structure(zip_ref.infolist(), root),
+                'logs': [],
+                'configs': {},
+                'metadata': {}
+            }
+
+            for info in entries:
+                parts = self._zip_parts(info.filename)
+                if root:
+                    parts = parts[1:]
+                if not parts:
+                    continue
 
-            return self.parse_folder(folder_path)
+                file = parts[-1]
+                relative_path = os.path.join(*parts)
+
+                if self._is_log_file(file):
+                    log_data = self._parse_log_bytes(file, zip_ref.read(info), info.filename)
+                    if log_data:
+                        log_data['path'] = relative_path
+                        result['logs'].append(log_data)
+
+                elif self._is_config_file(file):
+                    config_data = self._parse_config_bytes(zip_ref.read(info), info.filename)
+                    if config_data:
+                        result['configs'][file] = config_data
+
+        result['metadata'] = self._extract_metadata(result)
+        return result
+
+    def _zip_parts(self, filename: str) -> List[str]:
+        """Split a zip member name into path components"""
+        return [part for part in filename.split('/') if part]
+
+    def _build_zip_structure(self, infolist: List[zipfile.ZipInfo], root: Optional[str]) -> Dict:
+        """Build tree structure of an archive's top level"""
+        structure = {
+            'name': root or '',
+            'type': 'directory',
+            'children': []
+        }
+
+        children = {}
+        for info in infolist:
+            parts = self._zip_parts(info.filename)
+            if root:
+                parts = parts[1:]
+            if not parts:
+                continue
+
+            name = parts[0]
+            if len(parts) > 1 or info.is_dir():
+                children[name] = {
+                    'name': name,
+                    'type': 'directory',
+                    'children': []
+                }
+            elif name not in children:
+                children[name] = {
+                    'name': name,
+                    'type': 'file',
+                    'size': info.file_size,
+                    'extension': os.path.splitext(name)[1]
+                }
+
+        structure['children'] = [children[name] for name in sorted(children)]
+        return structure
 
     def parse_jsonl_logs(self, file_path: str) -> List[Dict]:
         """Parse JSONL log format"""
-        logs = []
         try:
             with open(file_path, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        try:
-                            log_entry = json.loads(line)
-                            logs.append(log_entry)
-                        except json.JSONDecodeError:
-                            continue
+                return self._parse_jsonl_lines(f)
         except Exception as e:
             print(f"Error parsing JSONL: {e}")
 
+        return []
+
+    def _parse_jsonl_lines(self, lines) -> List[Dict]:
+        """Parse an iterable of JSONL lines, skipping malformed entries"""
+        logs = []
+        for line in lines:
+            line = line.strip()
+            if line:
+                try:
+                    log_entry = json.loads(line)
+                    logs.append(log_entry)
+                except json.JSONDecodeError:
+                    continue
+
         return logs
 
     def _detect_folder_type(self, folder_path: str) -> str:
@@ -145,6 +221,7 @@ class FolderParser:
                 return {
                     'format': 'json',
                     'data': data,
+                    'entry_count': 1,
                     'size': os.path.getsize(file_path)
                 }
 
@@ -154,6 +231,7 @@ class FolderParser:
                 return {
                     'format': 'text',
                     'content': content,
+                    'entry_count': 1,
                     'size': len(content)
                 }
 
@@ -170,14 +248,54 @@ class FolderParser:
             print(f"Error parsing config file {file_path}: {e}")
             return None
 
+    def _parse_log_bytes(self, filename: str, data: bytes, source: str) -> Optional[Dict]:
+        """Parse a log file read straight out of an archive"""
+        try:
+            ext = os.path.splitext(filename)[1]
+            text = data.decode('utf-8')
+
+            if ext == '.jsonl':
+                logs = self._parse_jsonl_lines(text.splitlines())
+                return {
+                    'format': 'jsonl',
+                    'entries': logs,
+                    'entry_count': len(logs),
+                    'size': len(data)
+                }
+
+            elif ext == '.json':
+                return {
+                    'format': 'json',
+                    'data': json.loads(text),
+                    'entry_count': 1,
+                    'size': len(data)
+                }
+
+            else:
+                return {
+                    'format': 'text',
+                    'content': text,
+                    'entry_count': 1,
+                    'size': len(text)
+                }
+
+        except Exception as e:
+            print(f"Error parsing log file {source}: {e}")
+            return None
+
+    def _parse_config_bytes(self, data: bytes, source: str) -> Optional[Dict]:
+        """Parse a configuration file read straight out of an archive"""
+        try:
+            return json.loads(data)
+        except Exception as e:
+            print(f"Error parsing config file {source}: {e}")
+            return None
+
     def _extract_metadata(self, parsed_data: Dict) -> Dict:
         """Extract metadata from parsed folder"""
         metadata = {
             'total_logs': len(parsed_data['logs']),
-            'total_entries': sum(
-                log.get('entry_count', 0) if log.get('format') == 'jsonl' else 1
-                for log in parsed_data['logs']
-            ),
+            'total_entries': sum(log['entry_count'] for log in parsed_data['logs']),
             'config_files': list(parsed_data['configs'].keys()),
             'has_mcp_config': 'mcp.json' in parsed_data['configs'],
             'has_subagents': 'subagents.json' in parsed_data['configs']
@@ -216,8 +334,42 @@ class FolderParser:
 class ConfigAnalyzer:
     """Analyze configuration files and provide insights"""
 
+    def __init__(self, cache_size: int = 256):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+
+    def _config_digest(self, config: Dict) -> str:
+        """Hash the canonical JSON bytes of a config"""
+        raw = json.dumps(config, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def _cached(self, kind: str, config: Dict, analyze: Callable[[Dict], Dict]) -> Dict:
+        """Return a memoized analysis result for an identical config"""
+        key = (kind, self._config_digest(config))
+
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        else:
+            self._cache[key] = analyze(config)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        # Hand out a copy so callers can't mutate the cached result
+        return copy.deepcopy(self._cache[key])
+
     def analyze_mcp_config(self, mcp_config: Dict) -> Dict:
         """Analyze MCP server configuration"""
+        return self._cached('mcp', mcp_config, self._analyze_mcp_config)
+
+    def analyze_subagents(self, subagents_config: Dict) -> Dict:
+        """Analyze subagent configuration"""
+        return self._cached('subagents', subagents_config, self._analyze_subagents)
+
+    def analyze_interaction_style(self, config: Dict) -> Dict:
+        """Analyze interaction style settings"""
+        return self._cached('interaction_style', config, self._analyze_interaction_style)
+
+    def _analyze_mcp_config(self, mcp_config: Dict) -> Dict:
         servers = mcp_config.get('mcpServers', {})
 
         analysis = {
@@ -242,8 +394,7 @@ class ConfigAnalyzer:
 
         return analysis
 
-    def analyze_subagents(self, subagents_config: Dict) -> Dict:
-        """Analyze subagent configuration"""
+    def _analyze_subagents(self, subagents_config: Dict) -> Dict:
         subagents = subagents_config.get('subagents', [])
 
         analysis = {
@@ -267,8 +418,7 @@ class ConfigAnalyzer:
         analysis['capabilities'] = list(analysis['capabilities'])
         return analysis
 
-    def analyze_interaction_style(self, config: Dict) -> Dict:
-        """Analyze interaction style settings"""
+    def _analyze_interaction_style(self, config: Dict) -> Dict:
         style = config.get('interaction_style', {})
 
         return {
@@ -1,10 +1,11 @@
 import json
 import re
+from collections import deque
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     tool_name: str
     timestamp: datetime
@@ -12,21 +13,21 @@ class ToolCall:
     result: Optional[str] = None
     success: bool = True
 
-@dataclass
+@dataclass(slots=True)
 class FileOperation:
     operation_type: str
     file_path: str
     timestamp: datetime
     content_preview: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     role: str
     content: str
     timestamp: datetime
     tool_calls: List[ToolCall] = field(default_factory=list)
 
-@dataclass
+@dataclass(slots=True)
 class ParsedLog:
     messages: List[Message]
     tool_calls: List[ToolCall]
@@ -45,14 +46,16 @@ class LogParser:
         self.file_path_pattern = re.compile(r'[\'"](\/[^\'"]+\.[\w]+)[\'"]')
         self.todo_pattern = re.compile(r'(?:TODO|FIXME|XXX|HACK):\s*(.+?)$', re.MULTILINE)
         self.error_pattern = re.compile(r'(?i)(error|exception|failed|failure):\s*(.+?)(?:\n|$)')
+        self.dir_pattern = re.compile(r'Working Directory:\s*(\/[^\n]+)')
 
     def parse_log(self, log_content: str) -> ParsedLog:
         messages = []
         tool_calls = []
         file_operations = []
-        referenced_files = set()
-        recent_errors = []
-        last_todo_items = []
+        referenced_files = deque(maxlen=20)
+        seen_files = set()
+        recent_errors = deque(maxlen=10)
+        last_todo_items = deque(maxlen=10)
         current_timestamp = datetime.utcnow()
 
         for tool_match in self.tool_pattern.finditer(log_content):
@@ -73,7 +76,9 @@ class LogParser:
 
         for file_match in self.file_path_pattern.finditer(log_content):
             file_path = file_match.group(1)
-            referenced_files.add(file_path)
+            if file_path not in seen_files:
+                seen_files.add(file_path)
+                referenced_files.append(file_path)
 
         for todo_match in self.todo_pattern.finditer(log_content):
             last_todo_items.append(todo_match.group(1))
@@ -87,24 +92,27 @@ class LogParser:
             messages=messages,
             tool_calls=tool_calls,
             file_operations=file_operations,
-            referenced_files=list(referenced_files)[-20:],
+            referenced_files=list(referenced_files),
             active_directory=self._extract_working_dir(log_content),
             total_messages=len(lines),
             conversation_duration=None,
-            last_todo_items=last_todo_items[-10:],
-            recent_errors=recent_errors[-10:],
+            last_todo_items=list(last_todo_items),
+            recent_errors=list(recent_errors),
             metadata={
                 'total_tool_calls': len(tool_calls),
                 'total_file_ops': len(file_operations),
-                'total_files': len(referenced_files)
+                'total_files': len(seen_files)
             }
         )
 
     def _extract_working_dir(self, log_content: str) -> Optional[str]:
-        dir_pattern = re.compile(r'Working Directory:\s*(\/[^\n]+)')
-        match = dir_pattern.search(log_content)
+        match = self.dir_pattern.search(log_content)
         return match.group(1) if match else None
 
+_parser: Optional[LogParser] = None
+
 def parse_log(log_content: str) -> ParsedLog:
-    parser = LogParser()
-    return parser.parse_log(log_content)
+    global _parser
+    if _parser is None:
+        _parser = LogParser()
+    return _parser.parse_log(log_content)
@@ -1,5 +1,6 @@
 import re
-from typing import Set, List, Tuple
+from bisect import bisect_right
+from typing import Set, List, Optional, Tuple
 
 class SecretRedactor:
     def __init__(self):
@@ -30,38 +31,76 @@ class SecretRedactor:
         ]
 
         self.compiled_patterns = [(re.compile(pattern), name) for pattern, name in self.patterns]
+        self.combined_pattern = re.compile('|'.join(
+            f'(?:{self._scope_flags(pattern)})' for pattern, _ in self.patterns
+        ))
+        self.env_pattern = re.compile(r'(?i)(export\s+)?([A-Z_][A-Z0-9_]*)\s*=\s*["\']?([^"\'\s]+)["\']?')
+        self.sensitive_keywords = ('KEY', 'SECRET', 'TOKEN', 'PASSWORD', 'AUTH', 'CREDENTIAL')
+
+    @staticmethod
+    def _scope_flags(pattern: str) -> str:
+        # A leading (?i) is only legal at the start of the whole expression,
+        # so scope it to this alternative before joining.
+        if pattern.startswith('(?i)'):
+            return f'(?i:{pattern[4:]})'
+        return pattern
 
     def redact(self, text: str) -> Tuple[str, List[str]]:
-        redacted_text = text
-        found_secrets = []
+        # The combined alternation finds the leftmost secret of any kind, so
+        # text without secrets costs one scan and no pattern can match
+        # before the first hit
+        first = self.combined_pattern.search(text)
+        if first is None:
+            return text, []
 
+        # Where matches overlap, the pattern listed first wins; the combined
+        # alternation alone would pick the leftmost match instead. Accepted
+        # spans never overlap, so sorted starts also keep the ends sorted.
+        starts: List[int] = []
+        ends: List[int] = []
+        names: List[str] = []
         for pattern, secret_name in self.compiled_patterns:
-            matches = pattern.finditer(redacted_text)
-            for match in matches:
-                found_secrets.append(f"{secret_name} at position {match.start()}")
-                redacted_text = redacted_text[:match.start()] + f"[REDACTED_{secret_name}]" + redacted_text[match.end():]
+            for match in pattern.finditer(text, first.start()):
+                start, end = match.span()
+                index = bisect_right(starts, start)
+                if (index and ends[index - 1] > start) or (index < len(starts) and starts[index] < end):
+                    continue
+                starts.insert(index, start)
+                ends.insert(index, end)
+                names.insert(index, secret_name)
 
-        return redacted_text, list(set(found_secrets))
+        found_secrets = set()
+        pieces = []
+        position = 0
+        for start, end, secret_name in zip(starts, ends, names):
+            found_secrets.add(f"{secret_name} at position {start}")
+            pieces.append(text[position:start])
+            pieces.append(f"[REDACTED_{secret_name}]")
+            position = end
+        pieces.append(text[position:])
 
-    def redact_env_vars(self, text: str) -> str:
-        env_pattern = re.compile(r'(?i)(export\s+)?([A-Z_][A-Z0-9_]*)\s*=\s*["\']?([^"\'\s]+)["\']?')
+        return ''.join(pieces), list(found_secrets)
 
+    def redact_env_vars(self, text: str) -> str:
         def replace_env(match):
             var_name = match.group(2)
-            value = match.group(3)
+            upper_name = var_name.upper()
 
-            sensitive_keywords = ['KEY', 'SECRET', 'TOKEN', 'PASSWORD', 'AUTH', 'CREDENTIAL']
-            if any(keyword in var_name.upper() for keyword in sensitive_keywords):
+            if any(keyword in upper_name for keyword in self.sensitive_keywords):
                 return f"{match.group(1) or ''}{var_name}=[REDACTED_{var_name}]"
             return match.group(0)
 
-        return env_pattern.sub(replace_env, text)
+        return self.env_pattern.sub(replace_env, text)
 
     def full_redaction(self, text: str) -> Tuple[str, List[str]]:
         redacted, secrets = self.redact(text)
         redacted = self.redact_env_vars(redacted)
         return redacted, secrets
 
+_redactor: Optional[SecretRedactor] = None
+
 def redact_secrets(text: str) -> Tuple[str, List[str]]:
-    redactor = SecretRedactor()
-    return redactor.full_redaction(text)
+    global _redactor
+    if _redactor is None:
+        _redactor = SecretRedactor()
+    return _redactor.full_redaction(text)
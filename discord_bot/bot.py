@@ -9,6 +9,41 @@ from discord_bot.database import DiscordDatabase
 from discord_bot.suggestion_engine import SuggestionEngine
 from discord_bot.command_tracker import CommandTracker
 
+class SuggestionView(discord.ui.View):
+    def __init__(self, command_tracker: CommandTracker, author: discord.abc.User, command: str):
+        super().__init__(timeout=60)
+        self.command_tracker = command_tracker
+        self.author = author
+        self.command = command
+        self.message: Optional[discord.Message] = None
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author.id
+
+    @discord.ui.button(emoji='✅', style=discord.ButtonStyle.success)
+    async def accept_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.stop()
+        await interaction.response.edit_message(view=None)
+
+        await self.command_tracker.mark_suggestion_accepted(
+            user_id=str(self.author.id),
+            command_text=self.command
+        )
+        await interaction.followup.send(f"```\n{self.command}\n```")
+
+    @discord.ui.button(emoji='❌', style=discord.ButtonStyle.secondary)
+    async def dismiss_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.stop()
+        await interaction.response.defer()
+        await interaction.delete_original_response()
+
+    async def on_timeout(self):
+        if self.message:
+            try:
+                await self.message.delete()
+            except discord.HTTPException:
+                pass
+
 class ClaudeAssistantBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -25,19 +60,25 @@ class ClaudeAssistantBot(commands.Bot):
         self.db = DiscordDatabase()
         self.suggestion_engine = SuggestionEngine(self.db)
         self.command_tracker = CommandTracker(self.db)
+        self._background_tasks = set()
 
     async def setup_hook(self):
+        await self.db.connect()
         await self.load_extension('discord_bot.cogs.suggestions')
         await self.load_extension('discord_bot.cogs.kb_management')
         await self.load_extension('discord_bot.cogs.settings')
         print(f'Loaded {len(self.extensions)} extensions')
 
+    async def close(self):
+        await self.command_tracker.flush_patterns()
+        await super().close()
+        await self.db.close()
+
     async def on_ready(self):
         print(f'{self.user} has connected to Discord!')
         print(f'Connected to {len(self.guilds)} guilds')
 
-        for guild in self.guilds:
-            await self.db.register_server(str(guild.id), guild.name)
+        await self.db.register_servers([(str(guild.id), guild.name) for guild in self.guilds])
 
         await self.tree.sync()
         print('Command tree synced')
@@ -48,32 +89,43 @@ class ClaudeAssistantBot(commands.Bot):
 
         await self.process_commands(message)
 
-        user_prefs = await self.db.get_user_preferences(str(message.author.id))
+        user_id = str(message.author.id)
+        guild_id = str(message.guild.id) if message.guild else None
+
+        user_prefs, server_settings = await asyncio.gather(
+            self.db.get_user_preferences(user_id),
+            self.db.get_server_settings(guild_id)
+        )
 
         if not user_prefs or not user_prefs.get('enabled', True):
             return
 
-        server_settings = await self.db.get_server_settings(str(message.guild.id) if message.guild else None)
-
         if server_settings:
             enabled_channels = server_settings.get('settings', {}).get('enabled_channels', [])
             if enabled_channels and str(message.channel.id) not in enabled_channels:
                 return
 
-        await self.command_tracker.track_command(
-            user_id=str(message.author.id),
-            server_id=str(message.guild.id) if message.guild else None,
+        # Read the history once, before this message is stored, and share it
+        # with the tracker so storing can run in the background.
+        previous_context = await self.command_tracker.get_recent_context(user_id=user_id, limit=9)
+
+        # The store below finishes in the background, so mark the history as
+        # changed now; otherwise the user's next message could still read the
+        # cached history and suggestions from before this one
+        self.db.invalidate_history(user_id)
+
+        self._spawn(self.command_tracker.track_command(
+            user_id=user_id,
+            server_id=guild_id,
             channel_id=str(message.channel.id),
-            command_text=message.content
-        )
+            command_text=message.content,
+            context=previous_context[-5:]
+        ))
 
-        context = await self.command_tracker.get_recent_context(
-            user_id=str(message.author.id),
-            limit=10
-        )
+        context = previous_context + [{'command_text': message.content}]
 
         suggestions = await self.suggestion_engine.generate_suggestions(
-            user_id=str(message.author.id),
+            user_id=user_id,
             current_context=context,
             current_message=message.content,
             min_confidence=user_prefs.get('min_confidence', 0.6)
@@ -82,6 +134,19 @@ class ClaudeAssistantBot(commands.Bot):
         if suggestions:
             await self.send_suggestions(message, suggestions, user_prefs)
 
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_task_done)
+        return task
+
+    def _background_task_done(self, task: asyncio.Task):
+        self._background_tasks.discard(task)
+        # Nothing awaits these tasks, so report failures here instead of
+        # leaving them to "Task exception was never retrieved"
+        if not task.cancelled() and task.exception() is not None:
+            print(f'Background task failed: {task.exception()!r}')
+
     async def send_suggestions(self, message: discord.Message, suggestions: List[Dict], user_prefs: Dict):
         style = user_prefs.get('suggestion_style', 'inline')
 
@@ -104,30 +169,10 @@ class ClaudeAssistantBot(commands.Bot):
                     value=top_suggestion['source'],
                     inline=True
                 )
-                embed.set_footer(text="React with ✅ to use this command, or ignore to dismiss")
-
-                suggestion_msg = await message.reply(embed=embed, mention_author=False)
-
-                await suggestion_msg.add_reaction('✅')
-                await suggestion_msg.add_reaction('❌')
-
-                def check(reaction, user):
-                    return user == message.author and str(reaction.emoji) in ['✅', '❌'] and reaction.message.id == suggestion_msg.id
-
-                try:
-                    reaction, user = await self.wait_for('reaction_add', timeout=60.0, check=check)
-
-                    if str(reaction.emoji) == '✅':
-                        await self.command_tracker.mark_suggestion_accepted(
-                            user_id=str(message.author.id),
-                            command_text=top_suggestion['command']
-                        )
-                        await message.channel.send(f"```\n{top_suggestion['command']}\n```")
-                    else:
-                        await suggestion_msg.delete()
+                embed.set_footer(text="Press ✅ to use this command, or ignore to dismiss")
 
-                except asyncio.TimeoutError:
-                    await suggestion_msg.delete()
+                view = SuggestionView(self.command_tracker, message.author, top_suggestion['command'])
+                view.message = await message.reply(embed=embed, view=view, mention_author=False)
 
         elif style == 'buttons' and len(suggestions) > 0:
             embed = discord.Embed(
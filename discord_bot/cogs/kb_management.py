@@ -2,11 +2,37 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Optional
+from bisect import bisect_right
+from itertools import accumulate
 import re
 
+from discord_bot.cache import TTLCache
+
+BINARY_CONTENT_TYPES = ('image/', 'audio/', 'font/')
+PARAGRAPH_SPLIT = re.compile(r'\n\s*\n')
+
 class KnowledgeBaseCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Per-user search caches and rendered /kb-list embeds, both bounded
+        # and expiring like the database caches
+        self._search_cache = TTLCache(ttl=600, maxsize=1000)
+        self._kb_list_cache = TTLCache(ttl=300, maxsize=1000)
+        # Bumped on every document change, so a /kb-list render that raced
+        # with a change is not cached
+        self._kb_changes = 0
+
+    def _user_search_cache(self, user_id: str) -> TTLCache:
+        cache = self._search_cache.get(user_id)
+        if cache is None:
+            cache = TTLCache(ttl=600, maxsize=256)
+            self._search_cache.set(user_id, cache)
+        return cache
+
+    def _documents_changed(self, user_id: str):
+        self._kb_changes += 1
+        self._search_cache.invalidate(user_id)
+        self._kb_list_cache.invalidate(user_id)
 
     @app_commands.command(name="kb-upload", description="Upload a document to your knowledge base")
     async def upload_document(self, interaction: discord.Interaction, attachment: discord.Attachment):
@@ -26,9 +52,17 @@ class KnowledgeBaseCog(commands.Cog):
             )
             return
 
+        if attachment.content_type and attachment.content_type.startswith(BINARY_CONTENT_TYPES):
+            await interaction.followup.send(
+                "❌ That file doesn't look like text.",
+                ephemeral=True
+            )
+            return
+
         try:
             content = await attachment.read()
             content_text = content.decode('utf-8')
+            del content
 
             doc = await self.bot.db.store_kb_document(
                 user_id=str(interaction.user.id),
@@ -43,13 +77,19 @@ class KnowledgeBaseCog(commands.Cog):
 
             chunks = self._chunk_document(content_text)
 
-            for i, chunk in enumerate(chunks):
-                await self.bot.db.store_kb_chunk(
-                    document_id=doc['id'],
-                    chunk_index=i,
-                    content=chunk,
-                    metadata={'file_name': attachment.filename}
-                )
+            # Invalidate only once the chunks are in, or a search running
+            # between the two inserts would cache results without them
+            try:
+                await self.bot.db.store_kb_chunks_bulk(doc['id'], [
+                    {
+                        'chunk_index': i,
+                        'content': chunk,
+                        'metadata': {'file_name': attachment.filename}
+                    }
+                    for i, chunk in enumerate(chunks)
+                ])
+            finally:
+                self._documents_changed(str(interaction.user.id))
 
             await interaction.followup.send(
                 f"✅ Successfully uploaded **{attachment.filename}** to your knowledge base!\n"
@@ -68,7 +108,15 @@ class KnowledgeBaseCog(commands.Cog):
     async def search_kb(self, interaction: discord.Interaction, query: str):
         await interaction.response.defer(ephemeral=True)
 
-        results = await self.bot.db.search_kb_chunks(str(interaction.user.id), query, limit=5)
+        user_id = str(interaction.user.id)
+        cache = self._user_search_cache(user_id)
+        # Search is a case-insensitive ILIKE, so queries differing only in case share results
+        cache_key = query.lower()
+
+        results = cache.get(cache_key)
+        if results is None:
+            results = await self.bot.db.search_kb_chunks(user_id, query, limit=5)
+            cache.set(cache_key, results)
 
         if not results:
             await interaction.followup.send(
@@ -102,28 +150,37 @@ class KnowledgeBaseCog(commands.Cog):
     async def list_documents(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        user_result = self.bot.db.client.table('discord_users').select('id').eq('discord_id', str(interaction.user.id)).maybeSingle().execute()
-
-        if not user_result.data:
+        user_id = str(interaction.user.id)
+        # Entries are 1-tuples so that "no documents" (None) can be cached too
+        cached = self._kb_list_cache.get(user_id)
+        if cached is not None:
+            embed = cached[0]
+        else:
+            changes = self._kb_changes
+            embed = await self._render_document_list(user_id)
+            if self._kb_changes == changes:
+                self._kb_list_cache.set(user_id, (embed,))
+
+        if embed is None:
             await interaction.followup.send("You don't have any documents yet.", ephemeral=True)
             return
 
-        user_uuid = user_result.data['id']
+        await interaction.followup.send(embed=embed, ephemeral=True)
 
-        docs = self.bot.db.client.table('kb_documents').select('*').eq('user_id', user_uuid).execute()
+    async def _render_document_list(self, user_id: str) -> Optional[discord.Embed]:
+        docs, total = await self.bot.db.list_kb_documents(user_id, limit=10)
 
-        if not docs.data:
-            await interaction.followup.send("You don't have any documents yet.", ephemeral=True)
-            return
+        if not docs:
+            return None
 
         embed = discord.Embed(
             title="📚 Your Knowledge Base",
-            description=f"Total documents: {len(docs.data)}",
+            description=f"Total documents: {total}",
             color=discord.Color.green()
         )
 
-        for doc in docs.data[:10]:
-            size_kb = len(doc['content']) / 1024
+        for doc in docs:
+            size_kb = (doc.get('size_bytes') or 0) / 1024
 
             embed.add_field(
                 name=doc['file_name'],
@@ -131,32 +188,24 @@ class KnowledgeBaseCog(commands.Cog):
                 inline=False
             )
 
-        if len(docs.data) > 10:
-            embed.set_footer(text=f"Showing 10 of {len(docs.data)} documents")
+        if total > len(docs):
+            embed.set_footer(text=f"Showing {len(docs)} of {total} documents")
 
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        return embed
 
     @app_commands.command(name="kb-delete", description="Delete a document from your knowledge base")
     @app_commands.describe(filename="Name of the file to delete")
     async def delete_document(self, interaction: discord.Interaction, filename: str):
         await interaction.response.defer(ephemeral=True)
 
-        user_result = self.bot.db.client.table('discord_users').select('id').eq('discord_id', str(interaction.user.id)).maybeSingle().execute()
-
-        if not user_result.data:
-            await interaction.followup.send("Document not found.", ephemeral=True)
-            return
+        deleted = await self.bot.db.delete_kb_document(str(interaction.user.id), filename)
 
-        user_uuid = user_result.data['id']
-
-        doc = self.bot.db.client.table('kb_documents').select('id').eq('user_id', user_uuid).eq('file_name', filename).maybeSingle().execute()
-
-        if not doc.data:
+        if not deleted:
             await interaction.followup.send(f"Document **{filename}** not found.", ephemeral=True)
             return
 
-        self.bot.db.client.table('kb_chunks').delete().eq('document_id', doc.data['id']).execute()
-        self.bot.db.client.table('kb_documents').delete().eq('id', doc.data['id']).execute()
+        # Invalidate only after the delete has finished, as for uploads
+        self._documents_changed(str(interaction.user.id))
 
         await interaction.followup.send(
             f"✅ Successfully deleted **{filename}** from your knowledge base.",
@@ -164,27 +213,18 @@ class KnowledgeBaseCog(commands.Cog):
         )
 
     def _chunk_document(self, content: str, chunk_size: int = 500) -> list:
-        paragraphs = re.split(r'\n\s*\n', content)
-
-        chunks = []
-        current_chunk = []
-        current_size = 0
-
-        for para in paragraphs:
-            para_size = len(para)
+        paragraphs = PARAGRAPH_SPLIT.split(content)
+        offsets = [0, *accumulate(len(para) for para in paragraphs)]
 
-            if current_size + para_size > chunk_size and current_chunk:
-                chunks.append('\n\n'.join(current_chunk))
-                current_chunk = [para]
-                current_size = para_size
-            else:
-                current_chunk.append(para)
-                current_size += para_size
+        spans = []
+        start = 0
 
-        if current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
+        while start < len(paragraphs):
+            end = max(start + 1, bisect_right(offsets, offsets[start] + chunk_size) - 1)
+            spans.append((start, end))
+            start = end
 
-        return chunks
+        return ['\n\n'.join(paragraphs[start:end]) for start, end in spans]
 
 async def setup(bot):
     await bot.add_cog(KnowledgeBaseCog(bot))
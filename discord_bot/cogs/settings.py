@@ -3,6 +3,13 @@ from discord.ext import commands
 from discord import app_commands
 from typing import Literal
 
+DEFAULT_PREFS = {
+    'enabled': True,
+    'aggressiveness': 0.7,
+    'min_confidence': 0.6,
+    'suggestion_style': 'inline'
+}
+
 class SettingsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -12,12 +19,7 @@ class SettingsCog(commands.Cog):
         prefs = await self.bot.db.get_user_preferences(str(interaction.user.id))
 
         if not prefs:
-            prefs = {
-                'enabled': True,
-                'aggressiveness': 0.7,
-                'min_confidence': 0.6,
-                'suggestion_style': 'inline'
-            }
+            prefs = DEFAULT_PREFS
 
         embed = discord.Embed(
             title="⚙️ Your Bot Settings",
@@ -61,17 +63,15 @@ class SettingsCog(commands.Cog):
         prefs = await self.bot.db.get_user_preferences(str(interaction.user.id))
 
         if not prefs:
-            prefs = {
-                'enabled': True,
-                'aggressiveness': 0.7,
-                'min_confidence': 0.6,
-                'suggestion_style': 'inline'
-            }
+            prefs = dict(DEFAULT_PREFS)
 
         prefs['enabled'] = enabled
 
-        await self.bot.db.update_user_preferences(str(interaction.user.id), prefs)
-        await self.bot.db.register_user(str(interaction.user.id), str(interaction.user.name))
+        await self.bot.db.upsert_user_with_prefs(
+            str(interaction.user.id),
+            str(interaction.user.name),
+            prefs
+        )
 
         status = "enabled" if enabled else "disabled"
         await interaction.followup.send(f"✅ Command suggestions have been {status}.", ephemeral=True)
@@ -86,17 +86,15 @@ class SettingsCog(commands.Cog):
         prefs = await self.bot.db.get_user_preferences(str(interaction.user.id))
 
         if not prefs:
-            prefs = {
-                'enabled': True,
-                'aggressiveness': 0.7,
-                'min_confidence': 0.6,
-                'suggestion_style': 'inline'
-            }
+            prefs = dict(DEFAULT_PREFS)
 
         prefs['min_confidence'] = threshold
 
-        await self.bot.db.update_user_preferences(str(interaction.user.id), prefs)
-        await self.bot.db.register_user(str(interaction.user.id), str(interaction.user.name))
+        await self.bot.db.upsert_user_with_prefs(
+            str(interaction.user.id),
+            str(interaction.user.name),
+            prefs
+        )
 
         await interaction.followup.send(
             f"✅ Minimum confidence threshold set to {threshold:.0%}.",
@@ -115,20 +113,18 @@ class SettingsCog(commands.Cog):
         prefs = await self.bot.db.get_user_preferences(str(interaction.user.id))
 
         if not prefs:
-            prefs = {
-                'enabled': True,
-                'aggressiveness': 0.7,
-                'min_confidence': 0.6,
-                'suggestion_style': 'inline'
-            }
+            prefs = dict(DEFAULT_PREFS)
 
         prefs['suggestion_style'] = style
 
         if style == 'disabled':
             prefs['enabled'] = False
 
-        await self.bot.db.update_user_preferences(str(interaction.user.id), prefs)
-        await self.bot.db.register_user(str(interaction.user.id), str(interaction.user.name))
+        await self.bot.db.upsert_user_with_prefs(
+            str(interaction.user.id),
+            str(interaction.user.name),
+            prefs
+        )
 
         await interaction.followup.send(
             f"✅ Suggestion style set to **{style}**.",
@@ -139,15 +135,11 @@ class SettingsCog(commands.Cog):
     async def reset_settings(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
-        default_prefs = {
-            'enabled': True,
-            'aggressiveness': 0.7,
-            'min_confidence': 0.6,
-            'suggestion_style': 'inline'
-        }
-
-        await self.bot.db.update_user_preferences(str(interaction.user.id), default_prefs)
-        await self.bot.db.register_user(str(interaction.user.id), str(interaction.user.name))
+        await self.bot.db.upsert_user_with_prefs(
+            str(interaction.user.id),
+            str(interaction.user.name),
+            dict(DEFAULT_PREFS)
+        )
 
         await interaction.followup.send(
             "✅ All settings have been reset to defaults.",
@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 from typing import Optional
+import heapq
 
 class SuggestionsCog(commands.Cog):
     def __init__(self, bot):
@@ -74,7 +75,7 @@ class SuggestionsCog(commands.Cog):
         )
 
         if stats['command_types']:
-            top_types = sorted(stats['command_types'].items(), key=lambda x: x[1], reverse=True)[:5]
+            top_types = heapq.nlargest(5, stats['command_types'].items(), key=lambda x: x[1])
             type_text = '\n'.join([f"• {cmd_type}: {count}" for cmd_type, count in top_types])
             embed.add_field(
                 name="Most Used Command Types",
@@ -133,15 +134,9 @@ class ConfirmClearView(discord.ui.View):
 
     @discord.ui.button(label="Yes, clear my history", style=discord.ButtonStyle.danger)
     async def confirm_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        user_result = self.bot.db.client.table('discord_users').select('id').eq('discord_id', str(self.user_id)).maybeSingle().execute()
-
-        if user_result.data:
-            user_uuid = user_result.data['id']
-
-            self.bot.db.client.table('command_history').delete().eq('user_id', user_uuid).execute()
-            self.bot.db.client.table('command_patterns').delete().eq('user_id', user_uuid).execute()
-            self.bot.db.client.table('command_suggestions').delete().eq('user_id', user_uuid).execute()
+        cleared = await self.bot.db.clear_user_history(str(self.user_id))
 
+        if cleared:
             await interaction.response.edit_message(
                 content="✅ Your command history has been cleared.",
                 view=None
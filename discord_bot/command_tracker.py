@@ -1,16 +1,44 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
+import asyncio
+import functools
 import hashlib
 
 from discord_bot.database import DiscordDatabase
 
+COMMAND_TYPES = {
+    'git': 'git', 'gh': 'git',
+    'npm': 'package_manager', 'yarn': 'package_manager', 'pnpm': 'package_manager', 'npx': 'package_manager',
+    'cd': 'filesystem', 'ls': 'filesystem', 'mkdir': 'filesystem', 'rm': 'filesystem', 'mv': 'filesystem', 'cp': 'filesystem',
+    'python': 'python', 'pip': 'python', 'pytest': 'python',
+    'node': 'javascript', 'deno': 'javascript',
+    'docker': 'containers', 'kubectl': 'containers',
+}
+
+def hash_context(context: List[Dict]) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+
+    for i, cmd in enumerate(context):
+        if i:
+            digest.update(b'|')
+        digest.update(cmd['command_text'].encode())
+
+    return digest.hexdigest()
+
 class CommandTracker:
-    def __init__(self, db: DiscordDatabase):
+    __slots__ = ('db', 'flush_interval', '_pattern_buffer', '_flush_task')
+
+    def __init__(self, db: DiscordDatabase, flush_interval: float = 2.0):
         self.db = db
+        self.flush_interval = flush_interval
+        self._pattern_buffer: Dict[Tuple[str, str], Dict] = {}
+        self._flush_task: Optional[asyncio.Task] = None
 
     async def track_command(self, user_id: str, server_id: Optional[str], channel_id: str,
-                           command_text: str, was_suggested: bool = False) -> Dict:
-        context = await self.get_recent_context(user_id, limit=5)
+                           command_text: str, was_suggested: bool = False,
+                           context: Optional[List[Dict]] = None) -> Dict:
+        if context is None:
+            context = await self.get_recent_context(user_id, limit=5)
 
         context_text = ' '.join([cmd['command_text'] for cmd in context]) if context else ''
 
@@ -45,28 +73,23 @@ class CommandTracker:
             server_id=None,
             channel_id='dm',
             command_text=command_text,
-            was_suggested=True
+            was_suggested=True,
+            context=context
         )
 
-    def _classify_command(self, command_text: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _classify_command(command_text: str) -> str:
         command_lower = command_text.lower().strip()
 
-        if command_lower.startswith(('git ', 'gh ')):
-            return 'git'
-        elif command_lower.startswith(('npm ', 'yarn ', 'pnpm ', 'npx ')):
-            return 'package_manager'
-        elif command_lower.startswith(('cd ', 'ls ', 'mkdir ', 'rm ', 'mv ', 'cp ')):
-            return 'filesystem'
-        elif command_lower.startswith(('python ', 'pip ', 'pytest ')):
-            return 'python'
-        elif command_lower.startswith(('node ', 'deno ')):
-            return 'javascript'
-        elif command_lower.startswith(('docker ', 'kubectl ')):
-            return 'containers'
-        elif command_lower.startswith('!'):
+        if command_lower.startswith('!'):
             return 'bot_command'
-        else:
-            return 'unknown'
+
+        program, separator, _ = command_lower.partition(' ')
+        if separator:
+            return COMMAND_TYPES.get(program, 'unknown')
+
+        return 'unknown'
 
     async def _update_patterns(self, user_id: str, command_text: str, context: List[Dict]):
         if len(context) < 2:
@@ -75,40 +98,52 @@ class CommandTracker:
         recent_commands = [cmd['command_text'] for cmd in context[-3:]]
         recent_commands.append(command_text)
 
-        command_types = [self._classify_command(cmd) for cmd in recent_commands]
+        pattern_signature = '->'.join(map(self._classify_command, recent_commands))
 
-        pattern_signature = '->'.join(command_types)
+        key = (user_id, pattern_signature)
+        buffered = self._pattern_buffer.get(key)
 
-        trigger_context = [cmd['command_text'] for cmd in context[-2:]]
+        if buffered:
+            buffered['occurrences'] += 1
+        else:
+            self._pattern_buffer[key] = {
+                'discord_id': user_id,
+                'pattern_name': pattern_signature,
+                'command_sequence': recent_commands,
+                'trigger_context': [cmd['command_text'] for cmd in context[-2:]],
+                'occurrences': 1
+            }
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_patterns_loop())
+
+    async def _flush_patterns_loop(self):
+        while self._pattern_buffer:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush_patterns()
+
+    async def flush_patterns(self):
+        if not self._pattern_buffer:
+            return
 
-        await self.db.update_command_pattern(
-            user_id=user_id,
-            pattern_name=pattern_signature,
-            command_sequence=recent_commands,
-            trigger_context=trigger_context
-        )
+        patterns = list(self._pattern_buffer.values())
+        self._pattern_buffer = {}
+
+        try:
+            await self.db.record_command_patterns(patterns)
+        except Exception as e:
+            print(f"Error flushing command patterns: {e}")
 
     def _generate_context_hash(self, context: List[Dict]) -> str:
-        context_string = '|'.join([cmd['command_text'] for cmd in context])
-        return hashlib.md5(context_string.encode()).hexdigest()
+        return hash_context(context)
 
     async def get_command_statistics(self, user_id: str) -> Dict:
-        history = await self.db.get_command_history(user_id, limit=1000)
-
-        total_commands = len(history)
-        command_types = {}
-        suggested_count = 0
-        accepted_count = 0
-
-        for cmd in history:
-            cmd_type = cmd.get('command_type', 'unknown')
-            command_types[cmd_type] = command_types.get(cmd_type, 0) + 1
-
-            if cmd.get('was_suggested'):
-                suggested_count += 1
+        rows = await self.db.get_command_stats(user_id, limit=1000)
 
-            if cmd.get('accepted_suggestion'):
-                accepted_count += 1
+        command_types = {row['command_type']: row['command_count'] for row in rows}
+        total_commands = sum(command_types.values())
+        suggested_count = sum(row['suggested_count'] for row in rows)
+        accepted_count = sum(row['accepted_count'] for row in rows)
 
         return {
             'total_commands': total_commands,
@@ -1,246 +1,584 @@
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from datetime import datetime
-import os
-from supabase import create_client, Client
 import hashlib
+import itertools
+import json
+import os
+import uuid
+from urllib.parse import urlsplit
 
-class DiscordDatabase:
-    def __init__(self):
-        url = os.getenv('VITE_SUPABASE_URL')
-        key = os.getenv('VITE_SUPABASE_ANON_KEY')
+import asyncpg
 
-        if not url or not key:
-            raise ValueError('Supabase credentials not found in environment')
+from discord_bot.cache import TTLCache
 
-        self.client: Client = create_client(url, key)
+def _row(record: Optional[asyncpg.Record]) -> Optional[Dict]:
+    if record is None:
+        return None
 
-    async def register_user(self, discord_id: str, username: str) -> Dict:
-        result = self.client.table('discord_users').select('*').eq('discord_id', discord_id).maybeSingle().execute()
+    # Keep the JSON shapes the bot used to get back from PostgREST
+    row = {}
+    for key, value in record.items():
+        if isinstance(value, uuid.UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        row[key] = value
+
+    return row
+
+def _rows(records: List[asyncpg.Record]) -> List[Dict]:
+    return [_row(record) for record in records]
+
+async def _init_connection(conn: asyncpg.Connection):
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            type_name,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema='pg_catalog'
+        )
 
-        if result.data:
-            self.client.table('discord_users').update({
-                'discord_username': username,
-                'last_active': datetime.utcnow().isoformat()
-            }).eq('discord_id', discord_id).execute()
-            return result.data
+    await conn.execute('SET jit = off')
 
-        result = self.client.table('discord_users').insert({
-            'discord_id': discord_id,
-            'discord_username': username
-        }).execute()
+# Supabase's transaction pooler hands each statement to any server
+# connection, so prepared statements only survive on the session
+# pooler (5432) or a direct connection
+TRANSACTION_POOLER_PORT = 6543
 
-        return result.data[0] if result.data else None
+class DiscordDatabase:
+    def __init__(self, min_pool_size: int = 2, max_pool_size: int = 5):
+        self.dsn = os.getenv('SUPABASE_DB_URL')
+
+        if not self.dsn:
+            raise ValueError('SUPABASE_DB_URL not found in environment')
+
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.statement_cache_size = 0 if urlsplit(self.dsn).port == TRANSACTION_POOLER_PORT else 100
+
+        self.pool: Optional[asyncpg.Pool] = None
+        self.preferences_cache = TTLCache(ttl=300, maxsize=10_000)
+        self.server_settings_cache = TTLCache(ttl=60)
+        self.user_uuid_cache = TTLCache(ttl=300, maxsize=10_000)
+        self.server_uuid_cache = TTLCache(ttl=300)
+        self.history_cache = TTLCache(ttl=15, maxsize=10_000)
+        self.patterns_cache = TTLCache(ttl=60, maxsize=10_000)
+        # Generations are never reused, so a user whose entry expired or was
+        # evicted starts a fresh one rather than matching an old cache key
+        self._history_generations = TTLCache(ttl=3600, maxsize=10_000)
+        self._generation_counter = itertools.count(1)
+
+    async def connect(self):
+        if self.pool is None:
+            self.pool = await asyncpg.create_pool(
+                self.dsn,
+                min_size=self.min_pool_size,
+                max_size=self.max_pool_size,
+                max_queries=50_000,
+                max_inactive_connection_lifetime=1800,
+                command_timeout=30,
+                statement_cache_size=self.statement_cache_size,
+                init=_init_connection
+            )
+
+    async def health_check(self) -> Dict:
+        if self.pool is None:
+            return {'ok': False, 'pool_size': 0, 'idle_connections': 0}
+
+        try:
+            async with self.pool.acquire() as conn:
+                ok = await conn.fetchval('SELECT 1') == 1
+        except (asyncpg.PostgresError, OSError):
+            ok = False
+
+        return {
+            'ok': ok,
+            'pool_size': self.pool.get_size(),
+            'idle_connections': self.pool.get_idle_size(),
+            'max_pool_size': self.pool.get_max_size()
+        }
+
+    async def close(self):
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    def history_generation(self, user_id: str) -> int:
+        generation = self._history_generations.get(user_id)
+        if generation is None:
+            generation = next(self._generation_counter)
+            self._history_generations.set(user_id, generation)
+        return generation
+
+    def invalidate_history(self, user_id: str):
+        self._history_changed(user_id)
+
+    def _history_changed(self, user_id: str):
+        self._history_generations.set(user_id, next(self._generation_counter))
+        self.history_cache.invalidate(user_id)
+
+    async def _resolve_user_uuid(self, conn: asyncpg.Connection, discord_id: str) -> Optional[uuid.UUID]:
+        user_uuid = self.user_uuid_cache.get(discord_id)
+
+        if user_uuid is None:
+            user_uuid = await conn.fetchval('SELECT id FROM discord_users WHERE discord_id = $1', discord_id)
+            if user_uuid:
+                self.user_uuid_cache.set(discord_id, user_uuid)
+
+        return user_uuid
+
+    async def _resolve_server_uuid(self, conn: asyncpg.Connection, guild_id: str) -> Optional[uuid.UUID]:
+        server_uuid = self.server_uuid_cache.get(guild_id)
+
+        if server_uuid is None:
+            server_uuid = await conn.fetchval('SELECT id FROM discord_servers WHERE discord_guild_id = $1', guild_id)
+            if server_uuid:
+                self.server_uuid_cache.set(guild_id, server_uuid)
+
+        return server_uuid
+
+    async def register_user(self, discord_id: str, username: str) -> Dict:
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''
+                INSERT INTO discord_users (discord_id, discord_username) VALUES ($1, $2)
+                ON CONFLICT (discord_id) DO UPDATE SET
+                    discord_username = EXCLUDED.discord_username,
+                    last_active = now()
+                RETURNING *
+                ''',
+                discord_id, username
+            )
+
+        if row:
+            self.user_uuid_cache.set(discord_id, row['id'])
+        return _row(row)
 
     async def register_server(self, guild_id: str, guild_name: str) -> Dict:
-        result = self.client.table('discord_servers').select('*').eq('discord_guild_id', guild_id).maybeSingle().execute()
+        self.server_settings_cache.invalidate(guild_id)
+
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''
+                INSERT INTO discord_servers (discord_guild_id, guild_name) VALUES ($1, $2)
+                ON CONFLICT (discord_guild_id) DO UPDATE SET guild_name = EXCLUDED.guild_name
+                RETURNING *
+                ''',
+                guild_id, guild_name
+            )
+
+        if row:
+            self.server_uuid_cache.set(guild_id, row['id'])
+        return _row(row)
+
+    async def register_servers(self, guilds: List[Tuple[str, str]]) -> List[Dict]:
+        if not guilds:
+            return []
 
-        if result.data:
-            self.client.table('discord_servers').update({
-                'guild_name': guild_name
-            }).eq('discord_guild_id', guild_id).execute()
-            return result.data
+        for guild_id, _ in guilds:
+            self.server_settings_cache.invalidate(guild_id)
 
-        result = self.client.table('discord_servers').insert({
-            'discord_guild_id': guild_id,
-            'guild_name': guild_name
-        }).execute()
+        guild_ids, guild_names = zip(*guilds)
 
-        return result.data[0] if result.data else None
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''
+                INSERT INTO discord_servers (discord_guild_id, guild_name)
+                SELECT * FROM unnest($1::text[], $2::text[])
+                ON CONFLICT (discord_guild_id) DO UPDATE SET guild_name = EXCLUDED.guild_name
+                RETURNING *
+                ''',
+                list(guild_ids), list(guild_names)
+            )
+
+        return _rows(rows)
 
     async def get_user_preferences(self, discord_id: str) -> Optional[Dict]:
-        result = self.client.table('discord_users').select('preferences').eq('discord_id', discord_id).maybeSingle().execute()
-        return result.data['preferences'] if result.data else None
+        cached = self.preferences_cache.get(discord_id)
+        if cached is not None:
+            return dict(cached)
+
+        async with self.pool.acquire() as conn:
+            preferences = await conn.fetchval(
+                'SELECT preferences FROM discord_users WHERE discord_id = $1', discord_id
+            )
+
+        if preferences is not None:
+            self.preferences_cache.set(discord_id, preferences)
+            return dict(preferences)
+
+        return None
 
     async def update_user_preferences(self, discord_id: str, preferences: Dict) -> bool:
         user = await self.register_user(discord_id, 'unknown')
         if not user:
             return False
 
-        self.client.table('discord_users').update({
-            'preferences': preferences
-        }).eq('discord_id', discord_id).execute()
+        async with self.pool.acquire() as conn:
+            await conn.execute(
+                'UPDATE discord_users SET preferences = $1 WHERE discord_id = $2',
+                preferences, discord_id
+            )
+
+        self.preferences_cache.set(discord_id, dict(preferences))
         return True
 
+    async def upsert_user_with_prefs(self, discord_id: str, username: str, preferences: Dict) -> Optional[Dict]:
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''
+                INSERT INTO discord_users (discord_id, discord_username, preferences, last_active)
+                VALUES ($1, $2, $3, now())
+                ON CONFLICT (discord_id) DO UPDATE SET
+                    discord_username = EXCLUDED.discord_username,
+                    preferences = EXCLUDED.preferences,
+                    last_active = EXCLUDED.last_active
+                RETURNING *
+                ''',
+                discord_id, username, preferences
+            )
+
+        self.preferences_cache.set(discord_id, dict(preferences))
+        if row:
+            self.user_uuid_cache.set(discord_id, row['id'])
+        return _row(row)
+
     async def get_server_settings(self, guild_id: Optional[str]) -> Optional[Dict]:
         if not guild_id:
             return None
 
-        result = self.client.table('discord_servers').select('*').eq('discord_guild_id', guild_id).maybeSingle().execute()
-        return result.data if result.data else None
-
-    async def store_command(self, user_id: str, server_id: Optional[str], channel_id: str,
-                           command_text: str, context_before: Optional[str] = None,
-                           command_type: str = 'unknown', was_suggested: bool = False) -> Dict:
-
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
+        cached = self.server_settings_cache.get(guild_id)
+        if cached is not None:
+            return cached
 
-        if not user_result.data:
-            await self.register_user(user_id, 'unknown')
-            user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow('SELECT * FROM discord_servers WHERE discord_guild_id = $1', guild_id)
 
-        user_uuid = user_result.data['id']
-        server_uuid = None
+        if row:
+            server = _row(row)
+            self.server_settings_cache.set(guild_id, server)
+            return server
 
-        if server_id:
-            server_result = self.client.table('discord_servers').select('id').eq('discord_guild_id', server_id).maybeSingle().execute()
-            if server_result.data:
-                server_uuid = server_result.data['id']
+        return None
 
-        result = self.client.table('command_history').insert({
-            'user_id': user_uuid,
-            'server_id': server_uuid,
-            'channel_id': channel_id,
-            'command_text': command_text,
-            'context_before': context_before,
-            'command_type': command_type,
-            'was_suggested': was_suggested
-        }).execute()
+    async def store_command(self, user_id: str, server_id: Optional[str], channel_id: str,
+                           command_text: str, context_before: Optional[str] = None,
+                           command_type: str = 'unknown', was_suggested: bool = False) -> Dict:
 
-        return result.data[0] if result.data else None
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                user_uuid = await self._resolve_user_uuid(conn, user_id)
+
+                if not user_uuid:
+                    # Commands are stored in the background, so a new user's
+                    # first messages can race to create the same row
+                    user_uuid = await conn.fetchval(
+                        '''
+                        INSERT INTO discord_users (discord_id, discord_username) VALUES ($1, $2)
+                        ON CONFLICT (discord_id) DO UPDATE SET discord_username = EXCLUDED.discord_username
+                        RETURNING id
+                        ''',
+                        user_id, 'unknown'
+                    )
+                    self.user_uuid_cache.set(user_id, user_uuid)
+
+                server_uuid = None
+
+                if server_id:
+                    server_uuid = await self._resolve_server_uuid(conn, server_id)
+
+                row = await conn.fetchrow(
+                    '''
+                    INSERT INTO command_history
+                        (user_id, server_id, channel_id, command_text, context_before, command_type, was_suggested)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    RETURNING *
+                    ''',
+                    user_uuid, server_uuid, channel_id, command_text, context_before, command_type, was_suggested
+                )
+
+        self._history_changed(user_id)
+        return _row(row)
 
     async def get_command_history(self, user_id: str, limit: int = 50) -> List[Dict]:
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
-
-        if not user_result.data:
-            return []
-
-        user_uuid = user_result.data['id']
-
-        result = self.client.table('command_history').select('*').eq('user_id', user_uuid).order('created_at', desc=True).limit(limit).execute()
-
-        return result.data if result.data else []
+        # A cached fetch can answer any smaller limit, or any limit at all
+        # once it came back short of its own limit
+        cached = self.history_cache.get(user_id)
+        if cached is not None:
+            cached_limit, cached_rows = cached
+            if limit <= cached_limit or len(cached_rows) < cached_limit:
+                return cached_rows[:limit]
+
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''
+                SELECT command_history.*
+                FROM command_history
+                JOIN discord_users ON discord_users.id = command_history.user_id
+                WHERE discord_users.discord_id = $1
+                ORDER BY command_history.created_at DESC
+                LIMIT $2
+                ''',
+                user_id, limit
+            )
+
+        history = _rows(rows)
+        self.history_cache.set(user_id, (limit, history))
+        return history
+
+    async def get_command_frequencies(self, user_id: str, window: int = 200,
+                                      limit: int = 10) -> Tuple[List[Dict], int]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''
+                SELECT command_text, count(*) AS command_count,
+                       sum(count(*)) OVER ()::bigint AS total_count
+                FROM (
+                    SELECT command_history.command_text, command_history.created_at
+                    FROM command_history
+                    JOIN discord_users ON discord_users.id = command_history.user_id
+                    WHERE discord_users.discord_id = $1
+                    ORDER BY command_history.created_at DESC
+                    LIMIT $2
+                ) AS recent
+                GROUP BY command_text
+                ORDER BY command_count DESC, max(created_at) DESC
+                LIMIT $3
+                ''',
+                user_id, window, limit
+            )
+
+        frequencies = _rows(rows)
+        return frequencies, frequencies[0]['total_count'] if frequencies else 0
+
+    async def get_command_stats(self, user_id: str, limit: int = 1000) -> List[Dict]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch('SELECT * FROM get_command_stats($1, $2)', user_id, limit)
+
+        return _rows(rows)
 
     async def get_command_patterns(self, user_id: str) -> List[Dict]:
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
+        cached = self.patterns_cache.get(user_id)
+        if cached is not None:
+            return cached
 
-        if not user_result.data:
-            return []
+        async with self.pool.acquire() as conn:
+            user_uuid = await self._resolve_user_uuid(conn, user_id)
 
-        user_uuid = user_result.data['id']
+            if not user_uuid:
+                return []
 
-        result = self.client.table('command_patterns').select('*').eq('user_id', user_uuid).order('frequency', desc=True).execute()
+            rows = await conn.fetch(
+                'SELECT * FROM command_patterns WHERE user_id = $1 ORDER BY frequency DESC', user_uuid
+            )
 
-        return result.data if result.data else []
+        patterns = _rows(rows)
+        self.patterns_cache.set(user_id, patterns)
+        return patterns
 
     async def update_command_pattern(self, user_id: str, pattern_name: str,
                                     command_sequence: List[str], trigger_context: List[str]) -> bool:
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
-
-        if not user_result.data:
-            return False
-
-        user_uuid = user_result.data['id']
+        async with self.pool.acquire() as conn:
+            user_uuid = await self._resolve_user_uuid(conn, user_id)
+
+            if not user_uuid:
+                return False
+
+            await conn.execute(
+                '''
+                INSERT INTO command_patterns (user_id, pattern_name, trigger_context, command_sequence)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (user_id, pattern_name) DO UPDATE SET
+                    frequency = command_patterns.frequency + 1,
+                    last_used = now()
+                ''',
+                user_uuid, pattern_name, trigger_context, command_sequence
+            )
+
+        self.patterns_cache.invalidate(user_id)
+        return True
 
-        existing = self.client.table('command_patterns').select('*').eq('user_id', user_uuid).eq('pattern_name', pattern_name).maybeSingle().execute()
+    async def record_command_patterns(self, patterns: List[Dict]) -> bool:
+        if not patterns:
+            return True
 
-        if existing.data:
-            self.client.table('command_patterns').update({
-                'frequency': existing.data['frequency'] + 1,
-                'last_used': datetime.utcnow().isoformat()
-            }).eq('id', existing.data['id']).execute()
-        else:
-            self.client.table('command_patterns').insert({
-                'user_id': user_uuid,
-                'pattern_name': pattern_name,
-                'trigger_context': trigger_context,
-                'command_sequence': command_sequence
-            }).execute()
+        async with self.pool.acquire() as conn:
+            await conn.execute('SELECT record_command_patterns($1::jsonb)', patterns)
 
+        for pattern in patterns:
+            self.patterns_cache.invalidate(pattern['discord_id'])
         return True
 
     async def store_suggestion(self, user_id: str, context_hash: str, suggested_command: str,
                               source: str, confidence: float) -> Dict:
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
+        async with self.pool.acquire() as conn:
+            user_uuid = await self._resolve_user_uuid(conn, user_id)
+
+            if not user_uuid:
+                return None
+
+            row = await conn.fetchrow(
+                '''
+                INSERT INTO command_suggestions
+                    (user_id, context_hash, suggested_command, suggestion_source, confidence_score, was_shown)
+                VALUES ($1, $2, $3, $4, $5, TRUE)
+                RETURNING *
+                ''',
+                user_uuid, context_hash, suggested_command, source, confidence
+            )
+
+        return _row(row)
+
+    async def store_suggestions_bulk(self, user_id: str, context_hash: str, suggestions: List[Dict]) -> bool:
+        if not suggestions:
+            return True
+
+        async with self.pool.acquire() as conn:
+            user_uuid = await self._resolve_user_uuid(conn, user_id)
+
+            if not user_uuid:
+                return False
+
+            await conn.executemany(
+                '''
+                INSERT INTO command_suggestions
+                    (user_id, context_hash, suggested_command, suggestion_source, confidence_score, was_shown)
+                VALUES ($1, $2, $3, $4, $5, TRUE)
+                ''',
+                [
+                    (user_uuid, context_hash, suggestion['command'], suggestion['source'], suggestion['confidence'])
+                    for suggestion in suggestions
+                ]
+            )
 
-        if not user_result.data:
-            return None
-
-        user_uuid = user_result.data['id']
-
-        result = self.client.table('command_suggestions').insert({
-            'user_id': user_uuid,
-            'context_hash': context_hash,
-            'suggested_command': suggested_command,
-            'suggestion_source': source,
-            'confidence_score': confidence,
-            'was_shown': True
-        }).execute()
-
-        return result.data[0] if result.data else None
+        return True
 
     async def mark_suggestion_accepted(self, user_id: str, context_hash: str):
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
+        async with self.pool.acquire() as conn:
+            user_uuid = await self._resolve_user_uuid(conn, user_id)
 
-        if not user_result.data:
-            return
+            if not user_uuid:
+                return
 
-        user_uuid = user_result.data['id']
+            await conn.execute(
+                'UPDATE command_suggestions SET was_accepted = TRUE WHERE user_id = $1 AND context_hash = $2',
+                user_uuid, context_hash
+            )
 
-        self.client.table('command_suggestions').update({
-            'was_accepted': True
-        }).eq('user_id', user_uuid).eq('context_hash', context_hash).execute()
+    async def clear_user_history(self, user_id: str) -> bool:
+        async with self.pool.acquire() as conn:
+            cleared = await conn.fetchval('SELECT clear_user_history($1)', user_id)
 
-    async def store_kb_document(self, user_id: str, file_name: str, file_path: str, content: str) -> Dict:
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
+        self._history_changed(user_id)
+        self.patterns_cache.invalidate(user_id)
+        return bool(cleared)
 
-        if not user_result.data:
-            return None
-
-        user_uuid = user_result.data['id']
-
-        content_hash = hashlib.sha256(content.encode()).hexdigest()
-
-        existing = self.client.table('kb_documents').select('id').eq('user_id', user_uuid).eq('file_path', file_path).maybeSingle().execute()
-
-        if existing.data:
-            result = self.client.table('kb_documents').update({
-                'content': content,
-                'content_hash': content_hash,
-                'updated_at': datetime.utcnow().isoformat()
-            }).eq('id', existing.data['id']).execute()
-            return result.data[0] if result.data else None
-        else:
-            result = self.client.table('kb_documents').insert({
-                'user_id': user_uuid,
-                'file_name': file_name,
-                'file_path': file_path,
-                'content': content,
-                'content_hash': content_hash
-            }).execute()
-            return result.data[0] if result.data else None
+    async def store_kb_document(self, user_id: str, file_name: str, file_path: str, content: str) -> Dict:
+        content_bytes = content.encode()
+        content_hash = hashlib.sha256(content_bytes).hexdigest()
+        size_bytes = len(content_bytes)
+
+        async with self.pool.acquire() as conn:
+            user_uuid = await self._resolve_user_uuid(conn, user_id)
+
+            if not user_uuid:
+                return None
+
+            row = await conn.fetchrow(
+                '''
+                INSERT INTO kb_documents (user_id, file_name, file_path, content, content_hash, size_bytes)
+                VALUES ($1, $2, $3, $4, $5, $6)
+                ON CONFLICT (user_id, file_path) DO UPDATE SET
+                    content = EXCLUDED.content,
+                    content_hash = EXCLUDED.content_hash,
+                    size_bytes = EXCLUDED.size_bytes,
+                    updated_at = now()
+                RETURNING *
+                ''',
+                user_uuid, file_name, file_path, content, content_hash, size_bytes
+            )
+
+        return _row(row)
 
     async def store_kb_chunk(self, document_id: str, chunk_index: int, content: str,
                             embedding: Optional[List[float]] = None, metadata: Dict = None) -> Dict:
-        result = self.client.table('kb_chunks').insert({
-            'document_id': document_id,
-            'chunk_index': chunk_index,
-            'content': content,
-            'embedding': embedding,
-            'metadata': metadata or {}
-        }).execute()
-
-        return result.data[0] if result.data else None
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                '''
+                INSERT INTO kb_chunks (document_id, chunk_index, content, embedding, metadata)
+                VALUES ($1, $2, $3, $4::text::vector, $5)
+                RETURNING *
+                ''',
+                document_id, chunk_index, content,
+                json.dumps(embedding) if embedding is not None else None,
+                metadata or {}
+            )
+
+        return _row(row)
+
+    async def store_kb_chunks_bulk(self, document_id: str, chunks: List[Dict],
+                                   batch_size: int = 500) -> List[Dict]:
+        stored = []
+
+        async with self.pool.acquire() as conn:
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start:start + batch_size]
+                rows = await conn.fetch(
+                    '''
+                    INSERT INTO kb_chunks (document_id, chunk_index, content, metadata)
+                    SELECT $1::uuid, chunk.chunk_index, chunk.content, chunk.metadata::jsonb
+                    FROM unnest($2::int[], $3::text[], $4::text[]) AS chunk(chunk_index, content, metadata)
+                    RETURNING *
+                    ''',
+                    document_id,
+                    [chunk['chunk_index'] for chunk in batch],
+                    [chunk['content'] for chunk in batch],
+                    [json.dumps(chunk.get('metadata') or {}) for chunk in batch]
+                )
+                stored.extend(_rows(rows))
+
+        return stored
+
+    async def list_kb_documents(self, user_id: str, limit: int = 10) -> Tuple[List[Dict], int]:
+        async with self.pool.acquire() as conn:
+            rows = await conn.fetch(
+                '''
+                SELECT kb_documents.id, kb_documents.file_name, kb_documents.file_path,
+                       kb_documents.size_bytes, kb_documents.created_at,
+                       count(*) OVER () AS total_count
+                FROM kb_documents
+                JOIN discord_users ON discord_users.id = kb_documents.user_id
+                WHERE discord_users.discord_id = $1
+                ORDER BY kb_documents.created_at DESC
+                LIMIT $2
+                ''',
+                user_id, limit
+            )
+
+        docs = _rows(rows)
+        return docs, docs[0]['total_count'] if docs else 0
+
+    async def delete_kb_document(self, user_id: str, file_name: str) -> bool:
+        async with self.pool.acquire() as conn:
+            return bool(await conn.fetchval('SELECT delete_kb_document($1, $2)', user_id, file_name))
 
     async def search_kb_chunks(self, user_id: str, query: str, limit: int = 5) -> List[Dict]:
-        user_result = self.client.table('discord_users').select('id').eq('discord_id', user_id).maybeSingle().execute()
-
-        if not user_result.data:
-            return []
-
-        user_uuid = user_result.data['id']
-
-        docs = self.client.table('kb_documents').select('id').eq('user_id', user_uuid).execute()
-
-        if not docs.data:
-            return []
-
-        doc_ids = [doc['id'] for doc in docs.data]
-
-        results = []
-        for doc_id in doc_ids:
-            chunks = self.client.table('kb_chunks').select('*').eq('document_id', doc_id).ilike('content', f'%{query}%').limit(limit).execute()
-
-            if chunks.data:
-                results.extend(chunks.data)
-
-        return results[:limit]
+        async with self.pool.acquire() as conn:
+            user_uuid = await self._resolve_user_uuid(conn, user_id)
+
+            if not user_uuid:
+                return []
+
+            rows = await conn.fetch(
+                '''
+                SELECT kb_chunks.*
+                FROM kb_chunks
+                JOIN kb_documents ON kb_documents.id = kb_chunks.document_id
+                WHERE kb_documents.user_id = $1 AND kb_chunks.content ILIKE $2
+                ORDER BY similarity(kb_chunks.content, $3) DESC
+                LIMIT $4
+                ''',
+                user_uuid, f'%{query}%', query, limit
+            )
+
+        return _rows(rows)
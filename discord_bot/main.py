@@ -6,28 +6,28 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-from discord_bot.bot import run_bot
+REQUIRED_ENV_VARS = (
+    'DISCORD_BOT_TOKEN',
+    'SUPABASE_DB_URL'
+)
 
 def main():
     try:
         print("Starting Claude Assistant Discord Bot...")
         print(f"Python version: {sys.version}")
 
-        required_env_vars = [
-            'DISCORD_BOT_TOKEN',
-            'VITE_SUPABASE_URL',
-            'VITE_SUPABASE_ANON_KEY'
-        ]
-
-        missing_vars = [var for var in required_env_vars if not os.getenv(var)]
+        missing_vars = [var for var in REQUIRED_ENV_VARS if not os.getenv(var)]
 
         if missing_vars:
             print(f"ERROR: Missing required environment variables: {', '.join(missing_vars)}")
             print("\nPlease set the following in your .env file:")
-            for var in missing_vars:
-                print(f"  {var}=your_value_here")
+            print("\n".join(f"  {var}=your_value_here" for var in missing_vars))
             sys.exit(1)
 
+        # Imported only once the environment checks out, so a misconfigured
+        # start exits without loading discord.py and asyncpg
+        from discord_bot.bot import run_bot
+
         run_bot()
 
     except KeyboardInterrupt:
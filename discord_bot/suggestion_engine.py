@@ -1,47 +1,109 @@
-from typing import List, Dict, Optional
-from collections import Counter
+from typing import List, Dict, Optional, Set, Tuple
+from types import MappingProxyType
+from functools import partial
+from operator import itemgetter
+import asyncio
+import heapq
 import re
-import hashlib
 
+from discord_bot.cache import TTLCache
 from discord_bot.database import DiscordDatabase
+from discord_bot.command_tracker import hash_context
+
+CODE_BLOCK_PATTERN = re.compile(r'```(?:\w+)?\n(.*?)```', re.DOTALL)
+INLINE_CODE_PATTERN = re.compile(r'`([^`]+)`')
+
+COMMON_WORKFLOWS = (
+    ('git add', ('git commit -m "Update"', 'git status')),
+    ('git commit', ('git push', 'git push origin main')),
+    ('npm install', ('npm run dev', 'npm run build', 'npm test')),
+    ('npm run build', ('npm test', 'npm start')),
+    ('git pull', ('npm install', 'git status')),
+    ('git clone', ('cd', 'npm install')),
+    ('mkdir', ('cd', 'git init')),
+    ('touch', ('code .', 'vim')),
+    ('python', ('pytest', 'pip install')),
+    ('pip install', ('python', 'pytest')),
+)
+
+# Workflow suggestions never change and callers only read them, so each
+# trigger's suggestions are built once and shared read-only
+WORKFLOW_SUGGESTIONS = tuple(
+    (trigger, tuple(
+        MappingProxyType({'command': next_cmd, 'source': 'workflow', 'confidence': 0.7})
+        for next_cmd in next_commands
+    ))
+    for trigger, next_commands in COMMON_WORKFLOWS
+)
 
 class SuggestionEngine:
-    def __init__(self, db: DiscordDatabase):
+    def __init__(self, db: DiscordDatabase, cache_ttl: float = 10.0):
         self.db = db
+        self._suggestion_cache = TTLCache(ttl=cache_ttl, maxsize=1024)
+        self._inflight: Dict[Tuple, asyncio.Task] = {}
 
     async def generate_suggestions(self, user_id: str, current_context: List[Dict],
                                    current_message: str, min_confidence: float = 0.6) -> List[Dict]:
+        context_hash = self._generate_context_hash(current_context)
+
+        # The history generation changes whenever a command is stored, so
+        # cached results never outlive the history they were built from
+        cache_key = (user_id, context_hash, current_message, min_confidence,
+                     self.db.history_generation(user_id))
+
+        cached = self._suggestion_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
+        # Identical requests that arrive while one is still running share
+        # its result instead of repeating the database lookups
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._generate_suggestions(
+                user_id, current_context, current_message, min_confidence, context_hash, cache_key
+            ))
+            self._inflight[cache_key] = task
+            task.add_done_callback(partial(self._request_done, cache_key))
+
+        # Shielded so one caller being cancelled doesn't cancel the others
+        return list(await asyncio.shield(task))
+
+    def _request_done(self, cache_key: Tuple, task: asyncio.Task):
+        self._inflight.pop(cache_key, None)
+        # If every waiter was cancelled, nobody else retrieves the failure;
+        # retrieving it here keeps asyncio from logging it as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    async def _generate_suggestions(self, user_id: str, current_context: List[Dict], current_message: str,
+                                    min_confidence: float, context_hash: str, cache_key: Tuple) -> Tuple[Dict, ...]:
         suggestions = []
 
-        pattern_suggestions = await self._get_pattern_based_suggestions(user_id, current_context)
+        pattern_suggestions, frequency_suggestions, kb_suggestions = await asyncio.gather(
+            self._get_pattern_based_suggestions(user_id, current_context),
+            self._get_frequency_based_suggestions(user_id, current_context),
+            self._get_kb_based_suggestions(user_id, current_message)
+        )
         suggestions.extend(pattern_suggestions)
-
-        frequency_suggestions = await self._get_frequency_based_suggestions(user_id, current_context)
         suggestions.extend(frequency_suggestions)
-
-        kb_suggestions = await self._get_kb_based_suggestions(user_id, current_message)
         suggestions.extend(kb_suggestions)
 
         workflow_suggestions = self._get_workflow_suggestions(current_context, current_message)
         suggestions.extend(workflow_suggestions)
 
+        # Deduplicate before filtering: each command keeps the slot of its
+        # first appearance among all candidates, which breaks confidence ties
+        # below (nlargest is stable, like the sort it replaces)
         suggestions = self._deduplicate_suggestions(suggestions)
 
         suggestions = [s for s in suggestions if s['confidence'] >= min_confidence]
 
-        suggestions.sort(key=lambda x: x['confidence'], reverse=True)
+        top_suggestions = tuple(heapq.nlargest(5, suggestions, key=itemgetter('confidence')))
 
-        context_hash = self._generate_context_hash(current_context)
-        for suggestion in suggestions[:5]:
-            await self.db.store_suggestion(
-                user_id=user_id,
-                context_hash=context_hash,
-                suggested_command=suggestion['command'],
-                source=suggestion['source'],
-                confidence=suggestion['confidence']
-            )
+        await self.db.store_suggestions_bulk(user_id, context_hash, top_suggestions)
+        self._suggestion_cache.set(cache_key, top_suggestions)
 
-        return suggestions[:5]
+        return top_suggestions
 
     async def _get_pattern_based_suggestions(self, user_id: str, context: List[Dict]) -> List[Dict]:
         patterns = await self.db.get_command_patterns(user_id)
@@ -79,27 +141,27 @@ class SuggestionEngine:
         return suggestions
 
     async def _get_frequency_based_suggestions(self, user_id: str, context: List[Dict]) -> List[Dict]:
-        history = await self.db.get_command_history(user_id, limit=200)
+        frequencies, total_commands = await self.db.get_command_frequencies(user_id, window=200, limit=10)
 
-        if not history:
+        if not frequencies:
             return []
 
-        command_counts = Counter([cmd['command_text'] for cmd in history])
-
-        total_commands = len(history)
+        context_tokens = self._tokenize_context(context) if context else None
+        recent_commands = {cmd['command_text'] for cmd in context[-3:]}
 
         suggestions = []
 
-        for command, count in command_counts.most_common(10):
+        for row in frequencies:
+            command, count = row['command_text'], row['command_count']
             if count < 3:
                 continue
 
-            if any(cmd['command_text'] == command for cmd in context[-3:]):
+            if command in recent_commands:
                 continue
 
             frequency_score = min(count / total_commands * 10, 1.0)
 
-            context_relevance = self._calculate_context_relevance(command, context)
+            context_relevance = self._calculate_context_relevance(command, context_tokens)
 
             confidence = frequency_score * 0.4 + context_relevance * 0.6
 
@@ -143,31 +205,13 @@ class SuggestionEngine:
         if not context:
             return []
 
-        last_command = context[-1]['command_text'].lower().strip() if context else ''
-
-        common_workflows = {
-            'git add': ['git commit -m "Update"', 'git status'],
-            'git commit': ['git push', 'git push origin main'],
-            'npm install': ['npm run dev', 'npm run build', 'npm test'],
-            'npm run build': ['npm test', 'npm start'],
-            'git pull': ['npm install', 'git status'],
-            'git clone': ['cd', 'npm install'],
-            'mkdir': ['cd', 'git init'],
-            'touch': ['code .', 'vim'],
-            'python': ['pytest', 'pip install'],
-            'pip install': ['python', 'pytest'],
-        }
+        last_command = context[-1]['command_text'].lower().strip()
 
         suggestions = []
 
-        for trigger, next_commands in common_workflows.items():
+        for trigger, trigger_suggestions in WORKFLOW_SUGGESTIONS:
             if trigger in last_command:
-                for next_cmd in next_commands:
-                    suggestions.append({
-                        'command': next_cmd,
-                        'source': 'workflow',
-                        'confidence': 0.7
-                    })
+                suggestions.extend(trigger_suggestions)
 
         return suggestions
 
@@ -175,30 +219,37 @@ class SuggestionEngine:
         if not recent or not trigger:
             return 0.0
 
+        recent_len = len(recent)
+        trigger_len = len(trigger)
+
         matches = 0
         for i, trigger_cmd in enumerate(trigger):
-            if i < len(recent) and recent[-(len(trigger)-i)] == trigger_cmd:
+            if i < recent_len and recent[i - trigger_len] == trigger_cmd:
                 matches += 1
 
-        return matches / len(trigger) if trigger else 0.0
+        return matches / trigger_len
 
-    def _calculate_context_relevance(self, command: str, context: List[Dict]) -> float:
-        if not context:
+    @staticmethod
+    def _tokenize_context(context: List[Dict]) -> Set[str]:
+        context_text = ' '.join([cmd['command_text'] for cmd in context[-5:]])
+        return set(context_text.lower().split())
+
+    def _calculate_context_relevance(self, command: str, context_tokens: Optional[Set[str]]) -> float:
+        if context_tokens is None:
             return 0.5
 
         command_tokens = set(command.lower().split())
 
-        context_text = ' '.join([cmd['command_text'] for cmd in context[-5:]])
-        context_tokens = set(context_text.lower().split())
-
         overlap = len(command_tokens & context_tokens)
         total = len(command_tokens | context_tokens)
 
         return overlap / total if total > 0 else 0.3
 
     def _extract_commands_from_text(self, text: str) -> List[str]:
-        code_block_pattern = r'```(?:\w+)?\n(.*?)```'
-        code_blocks = re.findall(code_block_pattern, text, re.DOTALL)
+        if '`' not in text:
+            return []
+
+        code_blocks = CODE_BLOCK_PATTERN.findall(text)
 
         commands = []
 
@@ -209,8 +260,7 @@ class SuggestionEngine:
                 if line and not line.startswith('#') and not line.startswith('//'):
                     commands.append(line)
 
-        inline_code_pattern = r'`([^`]+)`'
-        inline_commands = re.findall(inline_code_pattern, text)
+        inline_commands = INLINE_CODE_PATTERN.findall(text)
 
         for cmd in inline_commands:
             if cmd and not cmd.startswith('#'):
@@ -223,12 +273,12 @@ class SuggestionEngine:
 
         for suggestion in suggestions:
             command = suggestion['command']
+            previous = seen.get(command)
 
-            if command not in seen or suggestion['confidence'] > seen[command]['confidence']:
+            if previous is None or suggestion['confidence'] > previous['confidence']:
                 seen[command] = suggestion
 
         return list(seen.values())
 
     def _generate_context_hash(self, context: List[Dict]) -> str:
-        context_string = '|'.join([cmd['command_text'] for cmd in context[-5:]])
-        return hashlib.md5(context_string.encode()).hexdigest()
+        return hash_context(context[-5:])
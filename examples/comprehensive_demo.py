@@ -3,34 +3,87 @@ Comprehensive demonstration of all repo graph planning components.
 """
 
 import asyncio
+import contextvars
+import io
 import sys
+import tempfile
+import traceback
 from pathlib import Path
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-# Import all major components
-from ontology_mapping.tags import create_component_tags, TagType
-from ontology_mapping.registry import ComponentRegistry, register_component
-from ontology_mapping.mapper import CapabilityMapper, capability_endpoint
+# Each demo imports its own subsystem when it runs, so running a subset of
+# the demos only pays for the subsystems they touch
 
-from repo_synthesis.analyzer import CodeAnalyzer, RepositoryStructure
 
-from multi_agent.agent import SpecializedAgent, Task, AgentCapability
-from multi_agent.communication import MessageBus
+# Sample sources analyzed by the demos
+SAMPLE_ANALYSIS_CODE = '''
+import numpy as np
+from typing import List, Optional
 
-from dag_execution.node import FunctionNode, CommandNode, node, NodeConfig, ExecutionContext
-from dag_execution.dag import DAG
+class DataProcessor:
+    """Processes data for machine learning."""
+    
+    def __init__(self, config: dict):
+        self.config = config
+        self.processed_count = 0
+    
+    def process(self, data: List[str]) -> np.ndarray:
+        """Process input data and return processed array."""
+        results = []
+        for item in data:
+            if item.strip():
+                results.append(len(item))
+            self.processed_count += 1
+        return np.array(results)
+    
+    def get_stats(self) -> dict:
+        """Get processing statistics."""
+        return {"processed": self.processed_count}
 
-from feature_extraction.extractors import TextFeatureExtractor, CodeFeatureExtractor, CompositeExtractor
+def main():
+    processor = DataProcessor({"batch_size": 32})
+    data = ["hello", "world", "test"]
+    result = processor.process(data)
+    print(result)
 
-from ml_orchestration.config import ExperimentConfig, ModelConfig, TrainingConfig, ConfigManager
+if __name__ == "__main__":
+    main()
+'''
 
-from nlp_capabilities.capabilities import get_capability, Document, CAPABILITY_REGISTRY
+SAMPLE_FEATURE_CODE = '''
+def hello_world():
+    """Print hello world."""
+    print("Hello, World!")
+    if True:
+        for i in range(3):
+            print(f"Count: {i}")
 
-from interface_patterns.interfaces import BaseModel, ClassificationModel, BatchInput, ModelOutput
+class Greeter:
+    def greet(self, name):
+        return f"Hello, {name}!"
+'''
 
-from test_plugins.hooks import create_plugin_manager, hookimpl
+# Demos run concurrently, so each one writes to its own scratch directory
+DEMO_TMP = Path(tempfile.gettempdir()) / "repo_graph_demos"
+
+# Buffer that print() output of the currently running demo goes to
+_demo_output: contextvars.ContextVar = contextvars.ContextVar("demo_output", default=None)
+
+
+class _DemoStdout:
+    """stdout proxy that routes each demo's output into its own buffer."""
+    
+    def __init__(self, stream):
+        self.stream = stream
+    
+    def write(self, text: str) -> int:
+        buffer = _demo_output.get()
+        return (buffer if buffer is not None else self.stream).write(text)
+    
+    def flush(self) -> None:
+        self.stream.flush()
 
 
 # Demo 1: Ontology Mapping System
@@ -38,6 +91,8 @@ def demo_ontology_mapping():
     """Demonstrate the ontology mapping system."""
     print("=== Ontology Mapping System Demo ===")
     
+    from ontology_mapping.registry import register_component, get_component_registry
+    
     # Register components with capabilities
     @register_component(
         "ml_transformer",
@@ -68,7 +123,6 @@ def demo_ontology_mapping():
             return f"Processed: {text}"
     
     # Query the registry
-    from ontology_mapping.registry import get_component_registry
     registry = get_component_registry()
     
     print(f"Total components: {len(registry.list_all())}")
@@ -94,48 +148,12 @@ def demo_repo_analysis():
     """Demonstrate repository analysis."""
     print("=== Repository Analysis Demo ===")
     
-    analyzer = CodeAnalyzer()
+    from repo_synthesis.analyzer import CodeAnalyzer
     
-    # Create sample code file for analysis
-    sample_code = '''
-import numpy as np
-from typing import List, Optional
-
-class DataProcessor:
-    """Processes data for machine learning."""
-    
-    def __init__(self, config: dict):
-        self.config = config
-        self.processed_count = 0
-    
-    def process(self, data: List[str]) -> np.ndarray:
-        """Process input data and return processed array."""
-        results = []
-        for item in data:
-            if item.strip():
-                results.append(len(item))
-            self.processed_count += 1
-        return np.array(results)
-    
-    def get_stats(self) -> dict:
-        """Get processing statistics."""
-        return {"processed": self.processed_count}
-
-def main():
-    processor = DataProcessor({"batch_size": 32})
-    data = ["hello", "world", "test"]
-    result = processor.process(data)
-    print(result)
-
-if __name__ == "__main__":
-    main()
-'''
-    
-    # Write sample file and analyze
-    sample_file = Path("/tmp/sample_code.py")
-    sample_file.write_text(sample_code)
+    analyzer = CodeAnalyzer()
     
-    file_info = analyzer.analyze_file(str(sample_file))
+    # Analyze the sample source in memory rather than via a scratch file
+    file_info = analyzer.analyze_source(SAMPLE_ANALYSIS_CODE, "<demo>/sample_code.py")
     
     print(f"File: {file_info.path}")
     print(f"Lines of code: {file_info.lines_of_code}")
@@ -160,6 +178,9 @@ async def demo_multi_agent():
     """Demonstrate multi-agent coordination."""
     print("=== Multi-Agent System Demo ===")
     
+    from multi_agent.agent import SpecializedAgent, Task
+    from multi_agent.communication import MessageBus
+    
     # Create message bus
     message_bus = MessageBus()
     
@@ -199,6 +220,9 @@ async def demo_dag_execution():
     """Demonstrate DAG-based execution."""
     print("=== DAG Execution Demo ===")
     
+    from dag_execution.node import node, ExecutionContext
+    from dag_execution.dag import DAG
+    
     # Create function nodes
     @node("data_loader", parameters={"source": "file"})
     def load_data(source: str) -> dict:
@@ -238,6 +262,8 @@ def demo_feature_extraction():
     """Demonstrate feature extraction."""
     print("=== Feature Extraction Demo ===")
     
+    from feature_extraction.extractors import TextFeatureExtractor, CodeFeatureExtractor
+    
     # Text feature extraction
     text_extractor = TextFeatureExtractor()
     sample_text = "Hello world! This is a test email: test@example.com. Visit https://example.com"
@@ -249,19 +275,7 @@ def demo_feature_extraction():
     
     # Code feature extraction
     code_extractor = CodeFeatureExtractor()
-    sample_code = '''
-def hello_world():
-    """Print hello world."""
-    print("Hello, World!")
-    if True:
-        for i in range(3):
-            print(f"Count: {i}")
-
-class Greeter:
-    def greet(self, name):
-        return f"Hello, {name}!"
-'''
-    code_features = code_extractor.extract(sample_code)
+    code_features = code_extractor.extract(SAMPLE_FEATURE_CODE)
     
     print(f"\nCode features extracted: {len(code_features.features)}")
     for feature in code_features.features:
@@ -275,8 +289,12 @@ def demo_ml_config():
     """Demonstrate ML configuration system."""
     print("=== ML Configuration Demo ===")
     
+    from ml_orchestration.config import ConfigManager
+    
     # Create configuration manager
-    config_manager = ConfigManager("/tmp/configs")
+    config_dir = DEMO_TMP / "ml_config" / "configs"
+    config_dir.parent.mkdir(parents=True, exist_ok=True)
+    config_manager = ConfigManager(str(config_dir))
     
     # Create experiment from template
     config = config_manager.create_from_template(
@@ -311,20 +329,21 @@ def demo_nlp_capabilities():
     """Demonstrate NLP capability system."""
     print("=== NLP Capabilities Demo ===")
     
+    from nlp_capabilities.capabilities import get_capability, Document
+    
     # Create document
     doc = Document(
         text="Apple Inc. is a great technology company. I love their products! Contact: info@apple.com",
         language="en"
     )
     
-    # Apply capabilities in pipeline
+    # Apply capabilities as one combined pipeline
     capabilities = ["tokenizer", "sentence_splitter", "ner", "sentiment_analysis"]
+    pipeline = get_capability("pipeline:" + ",".join(capabilities))
     
-    for cap_name in capabilities:
-        capability = get_capability(cap_name)
-        if capability and capability.can_process(doc):
-            doc = capability.process(doc)
-            print(f"Applied {cap_name}: {list(doc.annotations.keys())}")
+    if pipeline and pipeline.can_process(doc):
+        doc = pipeline.process(doc)
+        print(f"Applied {', '.join(capabilities)}: {list(doc.annotations.keys())}")
     
     # Show results  
     print(f"\nDocument annotations:")
@@ -342,6 +361,8 @@ def demo_interface_patterns():
     """Demonstrate interface patterns."""
     print("=== Interface Patterns Demo ===")
     
+    from interface_patterns.interfaces import ClassificationModel, BatchInput, ModelOutput
+    
     # Create mock model implementation
     class MockClassifier(ClassificationModel):
         def __init__(self):
@@ -378,26 +399,68 @@ def demo_interface_patterns():
     print(f"Class names: {model.class_names}")
     
     # Test save/load
-    model.save_pretrained("/tmp/mock_model")
-    loaded_model = MockClassifier.from_pretrained("/tmp/mock_model")
+    model_dir = DEMO_TMP / "interface_patterns" / "mock_model"
+    model_dir.parent.mkdir(parents=True, exist_ok=True)
+    model.save_pretrained(str(model_dir))
+    loaded_model = MockClassifier.from_pretrained(str(model_dir))
     print(f"Model loaded successfully: {loaded_model.get_parameters()}")
     
     print()
 
 
+async def _run_demo(demo, buffer: io.StringIO) -> None:
+    """Run one demo, in a worker thread if it is synchronous, writing its output to buffer."""
+    _demo_output.set(buffer)
+    
+    if asyncio.iscoroutinefunction(demo):
+        await demo()
+    else:
+        # to_thread copies the current context, so the thread writes to buffer too
+        await asyncio.to_thread(demo)
+
+
 # Main demonstration
 async def main():
     """Run all demonstrations."""
     print("🚀 Repo Graph Planning Project - Comprehensive Demo\n")
     
-    demo_ontology_mapping()
-    demo_repo_analysis()
-    await demo_multi_agent()
-    await demo_dag_execution()
-    demo_feature_extraction()
-    demo_ml_config()
-    demo_nlp_capabilities()
-    demo_interface_patterns()
+    demos = [
+        demo_ontology_mapping,
+        demo_repo_analysis,
+        demo_multi_agent,
+        demo_dag_execution,
+        demo_feature_extraction,
+        demo_ml_config,
+        demo_nlp_capabilities,
+        demo_interface_patterns,
+    ]
+    
+    # The demos touch disjoint subsystems, so run them concurrently and
+    # print each one's buffered output in the usual order. A failing demo
+    # must not cut the others short, so stdout is only restored once every
+    # demo has finished
+    buffers = [io.StringIO() for _ in demos]
+    stdout = sys.stdout
+    sys.stdout = _DemoStdout(stdout)
+    try:
+        results = await asyncio.gather(
+            *(_run_demo(demo, buffer) for demo, buffer in zip(demos, buffers)),
+            return_exceptions=True,
+        )
+    finally:
+        sys.stdout = stdout
+    
+    failed = 0
+    for buffer, result in zip(buffers, results):
+        print(buffer.getvalue(), end="")
+        if isinstance(result, BaseException):
+            failed += 1
+            traceback.print_exception(type(result), result, result.__traceback__, file=sys.stdout)
+            print()
+    
+    if failed:
+        print(f"❌ {failed} of {len(demos)} demos failed")
+        sys.exit(1)
     
     print("✨ All demos completed successfully!")
     print("\nThis demonstrates the core patterns from:")
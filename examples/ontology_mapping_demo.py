@@ -122,20 +122,15 @@ def main():
     capabilities = set()
     for comp_caps in matrix.values():
         capabilities.update(comp_caps.keys())
+    capabilities = sorted(capabilities)
     
-    # Print header
-    print("Component".ljust(20), end="")
-    for cap in sorted(capabilities):
-        print(cap[:15].ljust(16), end="")
-    print()
-    
-    # Print matrix
+    # Build the header and one row per component, then print the table at once
+    rows = ["Component".ljust(20) + "".join(cap[:15].ljust(16) for cap in capabilities)]
     for comp_name, comp_caps in matrix.items():
-        print(comp_name.ljust(20), end="")
-        for cap in sorted(capabilities):
-            value = comp_caps.get(cap, False)
-            print(str(value)[:15].ljust(16), end="")
-        print()
+        rows.append(comp_name.ljust(20) + "".join(
+            str(comp_caps.get(cap, False))[:15].ljust(16) for cap in capabilities
+        ))
+    print("\n".join(rows))
     
     print("\n=== API Specification ===")
     api_spec = mapper.generate_api_spec()
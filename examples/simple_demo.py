@@ -11,13 +11,29 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 # Import core components (avoiding heavy dependencies)
 from ontology_mapping.tags import create_component_tags, TagType
-from ontology_mapping.registry import ComponentRegistry, register_component
+from ontology_mapping.registry import ComponentRegistry, register_component, get_component_registry
 
 from feature_extraction.extractors import TextFeatureExtractor, CodeFeatureExtractor
 
 from nlp_capabilities.capabilities import get_capability, Document
 
 
+# Sample inputs for the feature extraction demos
+SAMPLE_TEXT = "Hello world! Visit https://example.com or email test@example.com"
+
+SAMPLE_CODE = '''
+def hello():
+    """Say hello."""
+    print("Hello, World!")
+    for i in range(3):
+        print(f"Count: {i}")
+
+class Greeter:
+    def greet(self, name):
+        return f"Hello, {name}!"
+'''
+
+
 def main():
     """Run core demonstrations."""
     print("🚀 Repo Graph Planning Project - Simple Demo\n")
@@ -36,7 +52,6 @@ def main():
         def process(self, text):
             return f"Processed: {text}"
     
-    from ontology_mapping.registry import get_component_registry
     registry = get_component_registry()
     
     print(f"Registered components: {len(registry.list_all())}")
@@ -48,8 +63,7 @@ def main():
     print("=== Feature Extraction ===")
     
     text_extractor = TextFeatureExtractor()
-    sample_text = "Hello world! Visit https://example.com or email test@example.com"
-    features = text_extractor.extract(sample_text)
+    features = text_extractor.extract(SAMPLE_TEXT)
     
     print(f"Extracted {len(features.features)} features:")
     for feature in features.features[:5]:
@@ -60,19 +74,7 @@ def main():
     print("=== Code Feature Extraction ===")
     
     code_extractor = CodeFeatureExtractor()
-    sample_code = '''
-def hello():
-    """Say hello."""
-    print("Hello, World!")
-    for i in range(3):
-        print(f"Count: {i}")
-
-class Greeter:
-    def greet(self, name):
-        return f"Hello, {name}!"
-'''
-    
-    code_features = code_extractor.extract(sample_code)
+    code_features = code_extractor.extract(SAMPLE_CODE)
     print(f"Code features extracted: {len(code_features.features)}")
     for feature in code_features.features:
         print(f"  {feature.name}: {feature.value}")
@@ -5,9 +5,18 @@ This module provides a framework for defining and executing directed acyclic gra
 of computation nodes, similar to Dagster's approach to data pipeline orchestration.
 """
 
-from .node import *
-from .dag import *
-from .executor import *
-from .config import *
+from .node import (
+    NodeState, ResourceType, ResourceRequirement, NodeInput, NodeOutput,
+    NodeConfig, ExecutionContext, ExecutionResult, BaseNode,
+    FunctionNode, CommandNode, ConditionalNode, node,
+)
+from .dag import DAGState, DAGExecutionResult, DAG
+
+__all__ = [
+    "NodeState", "ResourceType", "ResourceRequirement", "NodeInput", "NodeOutput",
+    "NodeConfig", "ExecutionContext", "ExecutionResult", "BaseNode",
+    "FunctionNode", "CommandNode", "ConditionalNode", "node",
+    "DAGState", "DAGExecutionResult", "DAG",
+]
 
 __version__ = "0.1.0"
\ No newline at end of file
@@ -3,13 +3,18 @@ Directed Acyclic Graph (DAG) execution system.
 """
 
 import asyncio
-from typing import Dict, List, Set, Optional, Any
+from collections import ChainMap, deque
+from concurrent.futures import Executor
+from typing import Dict, List, Set, Optional, Any, Iterable, Iterator, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
-import networkx as nx
+from graphlib import TopologicalSorter, CycleError
 from .node import BaseNode, NodeState, ExecutionContext, ExecutionResult
 
 
+__all__ = ["DAGState", "DAGExecutionResult", "DAG"]
+
+
 class DAGState(Enum):
     """States a DAG can be in during execution."""
     PENDING = "pending"
@@ -30,20 +35,77 @@ class DAGExecutionResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+class _Scheduler:
+    """Dependency bookkeeping for a single DAG run."""
+    
+    __slots__ = ("_ids", "_index", "_pending", "_dependents")
+    
+    def __init__(self, nodes: Dict[str, BaseNode]):
+        # Node ids are numbered once so the per-completion work is list indexing
+        self._ids = list(nodes)
+        self._index = {node_id: ix for ix, node_id in enumerate(self._ids)}
+        # Unfinished dependencies per node
+        self._pending = [len(node.dependencies) for node in nodes.values()]
+        self._dependents = [
+            tuple(self._index[dependent_id] for dependent_id in node.dependents)
+            for node in nodes.values()
+        ]
+    
+    def initial(self) -> List[str]:
+        """Nodes with no dependencies."""
+        return [self._ids[ix] for ix, count in enumerate(self._pending) if count == 0]
+    
+    def on_complete(self, node_id: str) -> List[str]:
+        """Record a completed node and return the dependents it made ready."""
+        pending = self._pending
+        released = []
+        for ix in self._dependents[self._index[node_id]]:
+            pending[ix] -= 1
+            if pending[ix] == 0:
+                released.append(self._ids[ix])
+        return released
+
+
 class DAG:
     """Directed Acyclic Graph for node execution."""
     
     def __init__(self, dag_id: str):
         self.dag_id = dag_id
-        self.graph = nx.DiGraph()
         self.nodes: Dict[str, BaseNode] = {}
+        # Adjacency in both directions, as ordered sets of node ids
+        self._successors: Dict[str, Dict[str, None]] = {}
+        self._predecessors: Dict[str, Dict[str, None]] = {}
         self.state = DAGState.PENDING
         self.metadata = {}
+        # Orderings and validation results, cleared whenever the structure changes
+        self._derived: Dict[str, Any] = {}
+    
+    def _structure_changed(self) -> None:
+        self._derived.clear()
+    
+    @property
+    def graph(self):
+        """Read-only networkx view of the DAG's structure.
+        
+        Built from the DAG's own adjacency on first access after a change;
+        use add_node/add_edge and friends to modify the DAG.
+        """
+        if "graph" not in self._derived:
+            import networkx as nx
+            
+            graph = nx.DiGraph()
+            graph.add_nodes_from(self._successors)
+            graph.add_edges_from(self.edges())
+            self._derived["graph"] = nx.freeze(graph)
+        
+        return self._derived["graph"]
     
     def add_node(self, node: BaseNode) -> None:
         """Add a node to the DAG."""
         self.nodes[node.node_id] = node
-        self.graph.add_node(node.node_id)
+        self._successors.setdefault(node.node_id, {})
+        self._predecessors.setdefault(node.node_id, {})
+        self._structure_changed()
     
     def add_edge(self, from_node_id: str, to_node_id: str) -> None:
         """Add an edge between two nodes."""
@@ -52,71 +114,182 @@ class DAG:
         if to_node_id not in self.nodes:
             raise ValueError(f"Node {to_node_id} not found in DAG")
         
-        self.graph.add_edge(from_node_id, to_node_id)
+        # The new edge closes a cycle only if it leads back to its own source
+        if self._reaches(to_node_id, from_node_id):
+            raise ValueError("Adding edge would create a cycle in the DAG")
+        
+        self._successors[from_node_id][to_node_id] = None
+        self._predecessors[to_node_id][from_node_id] = None
         
         # Update node dependencies
         self.nodes[to_node_id].add_dependency(from_node_id)
         self.nodes[from_node_id].add_dependent(to_node_id)
+        self._structure_changed()
+    
+    def bulk_add_edges(self, edges: Iterable[Tuple[str, str]]) -> None:
+        """Add many edges, checking for cycles once after all are added.
         
-        # Check for cycles
-        if not nx.is_directed_acyclic_graph(self.graph):
-            # Remove the edge that created the cycle
-            self.graph.remove_edge(from_node_id, to_node_id)
-            self.nodes[to_node_id].dependencies.remove(from_node_id)
-            self.nodes[from_node_id].dependents.remove(to_node_id)
-            raise ValueError("Adding edge would create a cycle in the DAG")
+        If the edges would create a cycle none of them are kept.
+        """
+        added = []
+        try:
+            for from_node_id, to_node_id in edges:
+                if from_node_id not in self.nodes:
+                    raise ValueError(f"Node {from_node_id} not found in DAG")
+                if to_node_id not in self.nodes:
+                    raise ValueError(f"Node {to_node_id} not found in DAG")
+                if self.has_edge(from_node_id, to_node_id):
+                    continue
+                
+                self._successors[from_node_id][to_node_id] = None
+                self._predecessors[to_node_id][from_node_id] = None
+                self.nodes[to_node_id].add_dependency(from_node_id)
+                self.nodes[from_node_id].add_dependent(to_node_id)
+                added.append((from_node_id, to_node_id))
+                self._structure_changed()
+            
+            if not self._is_acyclic():
+                raise ValueError("Adding edges would create a cycle in the DAG")
+        except ValueError:
+            for from_node_id, to_node_id in added:
+                self.remove_edge(from_node_id, to_node_id)
+            raise
+    
+    def _reaches(self, start_id: str, target_id: str) -> bool:
+        """Whether target_id can be reached from start_id along edges."""
+        if start_id == target_id:
+            return True
+        
+        seen = {start_id}
+        stack = [start_id]
+        while stack:
+            for successor in self._successors[stack.pop()]:
+                if successor == target_id:
+                    return True
+                if successor not in seen:
+                    seen.add(successor)
+                    stack.append(successor)
+        return False
+    
+    def _is_acyclic(self) -> bool:
+        try:
+            TopologicalSorter(self._predecessors).prepare()
+        except CycleError:
+            return False
+        return True
+    
+    def has_edge(self, from_node_id: str, to_node_id: str) -> bool:
+        """Check whether an edge exists between two nodes."""
+        return to_node_id in self._successors.get(from_node_id, ())
+    
+    def edges(self) -> List[Tuple[str, str]]:
+        """List all edges as (from_node_id, to_node_id) pairs."""
+        return [
+            (from_node_id, to_node_id)
+            for from_node_id, successors in self._successors.items()
+            for to_node_id in successors
+        ]
     
     def remove_node(self, node_id: str) -> None:
         """Remove a node from the DAG."""
         if node_id in self.nodes:
             del self.nodes[node_id]
-            self.graph.remove_node(node_id)
+            for successor in self._successors.pop(node_id, ()):
+                self._predecessors[successor].pop(node_id, None)
+            for predecessor in self._predecessors.pop(node_id, ()):
+                self._successors[predecessor].pop(node_id, None)
+            self._structure_changed()
     
     def remove_edge(self, from_node_id: str, to_node_id: str) -> None:
         """Remove an edge between two nodes."""
-        if self.graph.has_edge(from_node_id, to_node_id):
-            self.graph.remove_edge(from_node_id, to_node_id)
+        if self.has_edge(from_node_id, to_node_id):
+            del self._successors[from_node_id][to_node_id]
+            del self._predecessors[to_node_id][from_node_id]
             self.nodes[to_node_id].dependencies.remove(from_node_id)
             self.nodes[from_node_id].dependents.remove(to_node_id)
+            self._structure_changed()
     
     def get_ready_nodes(self, completed_nodes: Set[str]) -> List[BaseNode]:
         """Get nodes that are ready to execute."""
-        ready = []
-        for node_id, node in self.nodes.items():
-            if (node.state == NodeState.PENDING and 
-                node.can_execute(completed_nodes)):
-                ready.append(node)
-        return ready
+        # Dependencies are read from the DAG's own predecessor map, so only
+        # each node's state needs an attribute lookup
+        return [
+            self.nodes[node_id]
+            for node_id, predecessors in self._predecessors.items()
+            if self.nodes[node_id].state is NodeState.PENDING
+            and completed_nodes.issuperset(predecessors)
+        ]
     
     def get_topological_order(self) -> List[str]:
         """Get topological ordering of nodes."""
-        try:
-            return list(nx.topological_sort(self.graph))
-        except nx.NetworkXError:
-            raise ValueError("DAG contains cycles")
+        return list(self.iter_topological_order())
+    
+    def iter_topological_order(self) -> Iterator[str]:
+        """Iterate over the nodes in topological order without copying it."""
+        if "topological_order" not in self._derived:
+            try:
+                self._derived["topological_order"] = tuple(
+                    TopologicalSorter(self._predecessors).static_order()
+                )
+            except CycleError:
+                raise ValueError("DAG contains cycles")
+        
+        return iter(self._derived["topological_order"])
+    
+    def get_topological_levels(self) -> List[List[str]]:
+        """Group nodes into levels whose members only depend on earlier levels."""
+        if "topological_levels" not in self._derived:
+            topo_order = self.iter_topological_order()
+            
+            # A node's level is one past the deepest of its dependencies, so a
+            # single pass in topological order places every node
+            depth: Dict[str, int] = {}
+            levels: List[List[str]] = []
+            for node_id in topo_order:
+                level = max((depth[dep_id] + 1 for dep_id in self._predecessors[node_id]), default=0)
+                depth[node_id] = level
+                if level == len(levels):
+                    levels.append([])
+                levels[level].append(node_id)
+            self._derived["topological_levels"] = levels
+        
+        return [list(level) for level in self._derived["topological_levels"]]
     
     def validate(self) -> List[str]:
-        """Validate the DAG structure."""
+        """Validate the DAG structure.
+        
+        The result is reused until nodes or edges are changed through the
+        DAG's own methods.
+        """
+        if "validation_errors" not in self._derived:
+            self._derived["validation_errors"] = self._validate()
+        
+        return list(self._derived["validation_errors"])
+    
+    def _validate(self) -> List[str]:
         errors = []
         
-        # Check for cycles
-        if not nx.is_directed_acyclic_graph(self.graph):
+        # Check for cycles; add_edge and bulk_add_edges already refuse them,
+        # so this only catches adjacency changed behind the DAG's back
+        if not self._is_acyclic():
             errors.append("DAG contains cycles")
         
         # Check for isolated nodes (nodes with no connections)
-        isolated = list(nx.isolates(self.graph))
+        isolated = [
+            node_id for node_id, successors in self._successors.items()
+            if not successors and not self._predecessors[node_id]
+        ]
         if isolated and len(self.nodes) > 1:
             errors.append(f"Isolated nodes found: {isolated}")
         
         # Check that all referenced nodes exist
-        for node_id in self.graph.nodes():
+        for node_id in self._successors:
             if node_id not in self.nodes:
                 errors.append(f"Graph references non-existent node: {node_id}")
         
         # Check node dependencies match graph structure
         for node_id, node in self.nodes.items():
-            graph_predecessors = set(self.graph.predecessors(node_id))
-            if node.dependencies != graph_predecessors:
+            if node.dependencies != self._predecessors[node_id].keys():
                 errors.append(f"Node {node_id} dependencies don't match graph structure")
         
         return errors
@@ -124,16 +297,33 @@ class DAG:
     async def execute(
         self, 
         context: ExecutionContext,
-        max_parallel: int = 4
+        max_parallel: int = 4,
+        release_outputs: bool = False,
+        executor: Optional[Executor] = None
     ) -> Dict[str, ExecutionResult]:
-        """Execute the DAG."""
+        """Execute the DAG.
+        
+        Synchronous function nodes run on executor when one is given (a
+        ProcessPoolExecutor needs picklable functions), otherwise on the
+        event loop.
+        
+        With release_outputs, a node's outputs are cleared as soon as all of
+        its dependents have started, so only leaf nodes keep their outputs
+        in the returned results.
+        
+        A node that fails does not stop the run or raise: its result has
+        state FAILED, every node downstream of it gets a SKIPPED result
+        naming the failed upstream node, and independent branches still
+        run. The DAG's state ends up FAILED. Only an invalid DAG raises.
+        """
         import time
         
         start_time = time.time()
         self.state = DAGState.RUNNING
         
         try:
-            # Validate DAG before execution
+            # Validate DAG before execution; this is only recomputed when the
+            # structure changed since the last run
             validation_errors = self.validate()
             if validation_errors:
                 raise ValueError(f"DAG validation failed: {validation_errors}")
@@ -141,69 +331,124 @@ class DAG:
             completed_nodes = set()
             failed_nodes = set()
             node_results = {}
-            
-            # Create semaphore for parallel execution
-            semaphore = asyncio.Semaphore(max_parallel)
+            # Dependents that have yet to read each node's outputs
+            remaining_consumers = {node_id: len(node.dependents) for node_id, node in self.nodes.items()}
             
             async def execute_node(node: BaseNode) -> ExecutionResult:
-                """Execute a single node with semaphore."""
-                async with semaphore:
-                    node.state = NodeState.RUNNING
-                    
-                    # Prepare context with upstream outputs
-                    node_context = ExecutionContext(
-                        run_id=context.run_id,
-                        execution_time=time.time(),
-                        upstream_outputs=context.upstream_outputs.copy(),
-                        global_config=context.global_config,
-                        resources=context.resources,
-                        metadata=context.metadata
-                    )
-                    
-                    # Add outputs from completed dependencies
-                    for dep_id in node.dependencies:
-                        if dep_id in node_results:
-                            dep_result = node_results[dep_id]
-                            node_context.upstream_outputs.update(dep_result.outputs)
-                    
-                    # Execute node
-                    result = await node.execute(node_context)
-                    return result
-            
-            # Execute nodes in topological order with parallelization
-            while len(completed_nodes) + len(failed_nodes) < len(self.nodes):
-                # Get nodes ready for execution
-                ready_nodes = self.get_ready_nodes(completed_nodes)
+                """Execute a single node with its upstream outputs."""
+                node.state = NodeState.RUNNING
+                
+                # Layer the outputs of completed dependencies over the
+                # run's own upstream outputs without copying either; root
+                # nodes read the run's mapping directly
+                dep_outputs = [
+                    node_results[dep_id].outputs
+                    for dep_id in node.dependencies if dep_id in node_results
+                ]
+                upstream_outputs = (
+                    ChainMap(*dep_outputs, context.upstream_outputs)
+                    if dep_outputs else context.upstream_outputs
+                )
                 
-                if not ready_nodes:
-                    # Check if we're stuck due to failed dependencies
-                    remaining_nodes = set(self.nodes.keys()) - completed_nodes - failed_nodes
-                    if remaining_nodes:
-                        self.state = DAGState.FAILED
-                        raise RuntimeError(f"No ready nodes found, but {len(remaining_nodes)} nodes remain")
-                    break
+                if release_outputs:
+                    # dep_outputs above keeps what this node needs alive
+                    for dep_id in node.dependencies:
+                        remaining_consumers[dep_id] -= 1
+                        if remaining_consumers[dep_id] == 0 and dep_id in node_results:
+                            node_results[dep_id].outputs = {}
                 
-                # Execute ready nodes in parallel
-                tasks = [execute_node(node) for node in ready_nodes]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+                node_context = ExecutionContext(
+                    run_id=context.run_id,
+                    execution_time=time.time(),
+                    upstream_outputs=upstream_outputs,
+                    global_config=context.global_config,
+                    resources=context.resources,
+                    metadata=context.metadata,
+                    executor=executor or context.executor
+                )
                 
-                # Process results
-                for node, result in zip(ready_nodes, results):
-                    if isinstance(result, Exception):
-                        node.state = NodeState.FAILED
-                        failed_nodes.add(node.node_id)
-                        node_results[node.node_id] = ExecutionResult(
-                            node_id=node.node_id,
-                            state=NodeState.FAILED,
-                            error=str(result)
+                # Execute node
+                result = await node.execute(node_context)
+                return result
+            
+            def skip_downstream(node: BaseNode) -> None:
+                """Mark everything downstream of a failed node as skipped."""
+                queue = deque(node.dependents)
+                while queue:
+                    dependent = self.nodes[queue.popleft()]
+                    if dependent.state is NodeState.PENDING:
+                        dependent.state = NodeState.SKIPPED
+                        failed_nodes.add(dependent.node_id)
+                        node_results[dependent.node_id] = ExecutionResult(
+                            node_id=dependent.node_id,
+                            state=NodeState.SKIPPED,
+                            error=f"upstream {node.node_id} failed"
                         )
-                    else:
+                        queue.extend(dependent.dependents)
+            
+            # A node becomes ready as soon as its last dependency completes,
+            # without waiting on its siblings
+            scheduler = _Scheduler(self.nodes)
+            ready = deque(
+                self.nodes[node_id] for node_id in scheduler.initial()
+                if self.nodes[node_id].state is NodeState.PENDING
+            )
+            inflight: Dict[asyncio.Task, BaseNode] = {}
+            
+            def dispatch() -> None:
+                """Start ready nodes while fewer than max_parallel are running."""
+                while ready and len(inflight) < max_parallel:
+                    node = ready.popleft()
+                    inflight[asyncio.create_task(execute_node(node))] = node
+            
+            try:
+                dispatch()
+                while inflight:
+                    done, _ = await asyncio.wait(inflight, return_when=asyncio.FIRST_COMPLETED)
+                    
+                    for task in done:
+                        node = inflight.pop(task)
+                        if task.exception() is not None:
+                            result = ExecutionResult(
+                                node_id=node.node_id,
+                                state=NodeState.FAILED,
+                                error=str(task.exception())
+                            )
+                        else:
+                            result = task.result()
+                        
                         node.state = result.state
                         node_results[node.node_id] = result
-                        if result.state == NodeState.COMPLETED:
-                            completed_nodes.add(node.node_id)
-                        else:
+                        
+                        if result.state is not NodeState.COMPLETED:
                             failed_nodes.add(node.node_id)
+                            skip_downstream(node)
+                            continue
+                        
+                        completed_nodes.add(node.node_id)
+                        released = [
+                            self.nodes[dependent_id]
+                            for dependent_id in scheduler.on_complete(node.node_id)
+                            if self.nodes[dependent_id].state is NodeState.PENDING
+                        ]
+                        
+                        # Run newly released dependents ahead of older ready
+                        # nodes, so chains finish depth-first while their
+                        # inputs are fresh
+                        ready.extendleft(reversed(released))
+                    
+                    dispatch()
+            finally:
+                # Only non-empty if execution was interrupted
+                for task in inflight:
+                    task.cancel()
+            
+            # Nodes left over were not pending when the run started, so
+            # neither they nor anything downstream of them could run
+            remaining_nodes = set(self.nodes.keys()) - completed_nodes - failed_nodes
+            if remaining_nodes:
+                self.state = DAGState.FAILED
+                raise RuntimeError(f"No ready nodes found, but {len(remaining_nodes)} nodes remain")
             
             # Determine final state
             if failed_nodes:
@@ -223,24 +468,7 @@ class DAG:
     
     def get_execution_plan(self) -> Dict[str, Any]:
         """Get execution plan for the DAG."""
-        topo_order = self.get_topological_order()
-        
-        execution_levels = []
-        completed = set()
-        
-        while len(completed) < len(self.nodes):
-            current_level = []
-            for node_id in topo_order:
-                if node_id not in completed:
-                    node = self.nodes[node_id]
-                    if node.dependencies.issubset(completed):
-                        current_level.append(node_id)
-            
-            if not current_level:
-                break
-                
-            execution_levels.append(current_level)
-            completed.update(current_level)
+        execution_levels = self.get_topological_levels()
         
         return {
             "dag_id": self.dag_id,
@@ -254,12 +482,12 @@ class DAG:
         """Generate a text visualization of the DAG."""
         lines = [f"DAG: {self.dag_id}"]
         lines.append(f"Nodes: {len(self.nodes)}")
-        lines.append(f"Edges: {len(self.graph.edges())}")
+        lines.append(f"Edges: {sum(map(len, self._successors.values()))}")
         lines.append("")
         
         # Show topological order
         try:
-            topo_order = self.get_topological_order()
+            topo_order = self.iter_topological_order()
             lines.append("Execution Order:")
             for i, node_id in enumerate(topo_order):
                 node = self.nodes[node_id]
@@ -281,7 +509,7 @@ class DAG:
                 }
                 for node_id, node in self.nodes.items()
             },
-            "edges": list(self.graph.edges()),
+            "edges": self.edges(),
             "state": self.state.value,
             "metadata": self.metadata
         }
@@ -295,7 +523,7 @@ class DAG:
             new_dag.add_node(node)
         
         # Copy edges
-        for from_node, to_node in self.graph.edges():
+        for from_node, to_node in self.edges():
             new_dag.add_edge(from_node, to_node)
         
         # Copy metadata
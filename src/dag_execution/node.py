@@ -3,15 +3,25 @@ Execution nodes with configuration and resource management.
 """
 
 import asyncio
+from collections import ChainMap
+from concurrent.futures import Executor
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Set, Callable, Union
+from typing import Dict, List, Mapping, Optional, Any, Set, Callable, Tuple, Union
 from dataclasses import dataclass, field
 from enum import Enum
+import functools
 import uuid
 import time
 import json
 
 
+__all__ = [
+    "NodeState", "ResourceType", "ResourceRequirement", "NodeInput", "NodeOutput",
+    "NodeConfig", "ExecutionContext", "ExecutionResult", "BaseNode",
+    "FunctionNode", "CommandNode", "ConditionalNode", "node",
+]
+
+
 class NodeState(Enum):
     """States a node can be in during execution."""
     PENDING = "pending"
@@ -115,18 +125,21 @@ class NodeConfig:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionContext:
     """Context information for node execution."""
     run_id: str
     execution_time: float
-    upstream_outputs: Dict[str, Any] = field(default_factory=dict)
+    # Read-only view of upstream results; copy with dict() before changing it
+    upstream_outputs: Mapping[str, Any] = field(default_factory=dict)
     global_config: Dict[str, Any] = field(default_factory=dict)
     resources: Dict[ResourceType, float] = field(default_factory=dict)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Where synchronous node bodies run; None runs them on the event loop
+    executor: Optional[Executor] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Result of node execution."""
     node_id: str
@@ -156,7 +169,8 @@ class BaseNode(ABC):
         self.state = NodeState.PENDING
         self.dependencies: Set[str] = set()
         self.dependents: Set[str] = set()
-        self._event_handlers: Dict[str, List[Callable]] = {}
+        # event -> (handler, is coroutine function) pairs
+        self._event_handlers: Dict[str, List[Tuple[Callable, bool]]] = {}
     
     @abstractmethod
     async def execute(self, context: ExecutionContext) -> ExecutionResult:
@@ -200,19 +214,64 @@ class BaseNode(ABC):
         """Register an event handler."""
         if event not in self._event_handlers:
             self._event_handlers[event] = []
-        self._event_handlers[event].append(handler)
+        self._event_handlers[event].append((handler, asyncio.iscoroutinefunction(handler)))
     
     async def _emit_event(self, event: str, data: Dict[str, Any]) -> None:
-        """Emit an event to registered handlers."""
-        if event in self._event_handlers:
-            for handler in self._event_handlers[event]:
-                try:
-                    if asyncio.iscoroutinefunction(handler):
-                        await handler(self, event, data)
-                    else:
-                        handler(self, event, data)
-                except Exception as e:
-                    print(f"Error in event handler: {e}")
+        """Emit an event to registered handlers.
+        
+        Plain handlers run first, in order; coroutine handlers then run
+        concurrently.
+        """
+        handlers = self._event_handlers.get(event)
+        if not handlers:
+            return
+        
+        pending = []
+        for handler, is_coroutine in handlers:
+            if is_coroutine:
+                pending.append(handler(self, event, data))
+                continue
+            try:
+                handler(self, event, data)
+            except Exception as e:
+                print(f"Error in event handler: {e}")
+        
+        if pending:
+            for outcome in await asyncio.gather(*pending, return_exceptions=True):
+                if isinstance(outcome, Exception):
+                    print(f"Error in event handler: {outcome}")
+
+
+@functools.lru_cache(maxsize=1024)
+def _function_spec(
+    func: Callable
+) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, Any, bool, Any], ...], Any]:
+    """Parameter names, input fields and return type read from a function's signature.
+    
+    Cached per function, since the same function is often wrapped by many
+    nodes across DAGs. Only immutable tuples are cached, so every node
+    builds its own NodeInput and NodeOutput objects from them; the bounded
+    cache size limits how many functions it keeps alive.
+    """
+    import inspect
+    
+    sig = inspect.signature(func)
+    input_fields = []
+    
+    for param_name, param in sig.parameters.items():
+        if param_name == 'context':
+            continue  # Skip context parameter
+        
+        data_type = param.annotation if param.annotation != inspect.Parameter.empty else Any
+        required = param.default == inspect.Parameter.empty
+        default_value = param.default if not required else None
+        
+        input_fields.append((param_name, data_type, required, default_value))
+    
+    # For now, assume single output - could be enhanced
+    return_type = sig.return_annotation if sig.return_annotation != inspect.Parameter.empty else Any
+    
+    return tuple(sig.parameters), tuple(input_fields), return_type
 
 
 class FunctionNode(BaseNode):
@@ -225,37 +284,26 @@ class FunctionNode(BaseNode):
         config: Optional[NodeConfig] = None
     ):
         self.func = func
+        self._is_async = asyncio.iscoroutinefunction(func)
         # Auto-detect inputs and outputs from function signature
         inputs, outputs = self._analyze_function(func)
         super().__init__(node_id, config, inputs, outputs)
     
     def _analyze_function(self, func: Callable) -> tuple[List[NodeInput], List[NodeOutput]]:
         """Analyze function signature to determine inputs and outputs."""
-        import inspect
-        
-        sig = inspect.signature(func)
-        inputs = []
-        
-        for param_name, param in sig.parameters.items():
-            if param_name == 'context':
-                continue  # Skip context parameter
-            
-            data_type = param.annotation if param.annotation != inspect.Parameter.empty else Any
-            required = param.default == inspect.Parameter.empty
-            default_value = param.default if not required else None
-            
-            inputs.append(NodeInput(
-                name=param_name,
-                data_type=data_type,
-                required=required,
-                default_value=default_value
-            ))
-        
-        # For now, assume single output - could be enhanced
-        return_type = sig.return_annotation if sig.return_annotation != inspect.Parameter.empty else Any
-        outputs = [NodeOutput(name="result", data_type=return_type)]
+        try:
+            param_names, input_fields, return_type = _function_spec(func)
+        except TypeError:
+            # Unhashable callables can't be cached
+            param_names, input_fields, return_type = _function_spec.__wrapped__(func)
         
-        return inputs, outputs
+        # Kept so execute can bind arguments without inspecting the function again
+        self._param_names = param_names
+        inputs = [
+            NodeInput(name=name, data_type=data_type, required=required, default_value=default_value)
+            for name, data_type, required, default_value in input_fields
+        ]
+        return inputs, [NodeOutput(name="result", data_type=return_type)]
     
     async def execute(self, context: ExecutionContext) -> ExecutionResult:
         """Execute the wrapped function."""
@@ -264,11 +312,9 @@ class FunctionNode(BaseNode):
         
         try:
             # Prepare arguments
-            import inspect
-            sig = inspect.signature(self.func)
             args = {}
             
-            for param_name in sig.parameters.keys():
+            for param_name in self._param_names:
                 if param_name == 'context':
                     args[param_name] = context
                 elif param_name in context.upstream_outputs:
@@ -277,8 +323,12 @@ class FunctionNode(BaseNode):
                     args[param_name] = self.config.parameters[param_name]
             
             # Execute function
-            if asyncio.iscoroutinefunction(self.func):
+            if self._is_async:
                 output = await self.func(**args)
+            elif context.executor is not None:
+                output = await asyncio.get_running_loop().run_in_executor(
+                    context.executor, functools.partial(self.func, **args)
+                )
             else:
                 output = self.func(**args)
             
@@ -317,21 +367,19 @@ class CommandNode(BaseNode):
         result = ExecutionResult(node_id=self.node_id, state=NodeState.RUNNING)
         
         try:
-            # Format command with parameters
-            formatted_command = self.command.format(**self.config.parameters)
-            
-            # Add any command args from upstream
-            if "command_args" in context.upstream_outputs:
-                args = context.upstream_outputs["command_args"]
-                for key, value in args.items():
-                    formatted_command = formatted_command.replace(f"{{{key}}}", str(value))
+            # Format command in one pass, with command args from upstream
+            # taking precedence over the node's parameters
+            formatted_command = self.command.format_map(ChainMap(
+                context.upstream_outputs.get("command_args", {}),
+                self.config.parameters
+            ))
             
             # Execute command
             process = await asyncio.create_subprocess_shell(
                 formatted_command,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env={**self.config.environment}
+                env=self.config.environment
             )
             
             stdout_data, stderr_data = await process.communicate()
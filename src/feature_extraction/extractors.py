@@ -2,15 +2,71 @@
 Feature extractors for different data types and modalities.
 """
 
+import hashlib
 import re
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any, Union, Tuple
+from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, field
+from itertools import chain
 from pathlib import Path
 import json
 
 
+# Per-byte class table for counting ASCII text in one vectorized pass; each
+# column flags the bytes belonging to one of the classes in _CHAR_CLASSES
+_CHAR_CLASSES = ("alpha", "upper", "punct")
+_ASCII_CLASS_TABLE = np.array(
+    [[chr(c).isalpha(), chr(c).isupper(), chr(c) in '.,!?;:'] for c in range(128)],
+    dtype=np.int64,
+)
+
+# np.bincount widens its input to intp, so long texts are histogrammed in
+# chunks to keep that temporary small
+_HISTOGRAM_CHUNK = 1 << 16
+
+# Canonical encoding used to hash structured inputs into FeatureSet ids
+_ID_ENCODER = json.JSONEncoder(sort_keys=True, default=str)
+
+
+def _byte_stats(text: str) -> Dict[str, int]:
+    """Count alphabetic, uppercase and punctuation characters in text."""
+    if text.isascii():
+        data = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+        histogram = np.zeros(128, dtype=np.int64)
+        for start in range(0, data.size, _HISTOGRAM_CHUNK):
+            histogram += np.bincount(data[start:start + _HISTOGRAM_CHUNK], minlength=128)
+        return dict(zip(_CHAR_CLASSES, (histogram @ _ASCII_CLASS_TABLE).tolist()))
+    
+    # Non-ASCII text needs the full Unicode character classes
+    return {
+        "alpha": sum(map(str.isalpha, text)),
+        "upper": sum(map(str.isupper, text)),
+        "punct": sum(text.count(c) for c in '.,!?;:'),
+    }
+
+
+def _input_id(data: Any) -> str:
+    """Short stable identifier for an extractor input.
+    
+    Text and bytes are hashed directly; other inputs are hashed through
+    their JSON encoding, streamed chunk by chunk rather than rendered to a
+    single string first, falling back to repr() for unencodable data.
+    """
+    if isinstance(data, str):
+        return hashlib.blake2b(data.encode('utf-8', 'surrogatepass'), digest_size=4).hexdigest()
+    if isinstance(data, (bytes, bytearray)):
+        return hashlib.blake2b(data, digest_size=4).hexdigest()
+    
+    digest = hashlib.blake2b(digest_size=4)
+    try:
+        for chunk in _ID_ENCODER.iterencode(data):
+            digest.update(chunk.encode('utf-8', 'surrogatepass'))
+    except (TypeError, ValueError):
+        digest = hashlib.blake2b(repr(data).encode('utf-8', 'surrogatepass'), digest_size=4)
+    return digest.hexdigest()
+
+
 @dataclass
 class Feature:
     """Represents a single extracted feature."""
@@ -35,21 +91,49 @@ class FeatureSet:
     input_id: str
     features: List[Feature] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    # Name and type indexes over features, caught up lazily on lookup so that
+    # features appended straight to the list are picked up as well. Replacing
+    # or shortening the list is noticed too; swapping an already indexed
+    # feature for another in place is not, so assign a new list for that
+    _by_name: Dict[str, Feature] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _by_type: Dict[str, List[Feature]] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed: int = field(default=0, init=False, repr=False, compare=False)
+    _indexed_list: Optional[List[Feature]] = field(default=None, init=False, repr=False, compare=False)
+    _last_indexed: Optional[Feature] = field(default=None, init=False, repr=False, compare=False)
     
     def add_feature(self, feature: Feature) -> None:
         """Add a feature to this set."""
         self.features.append(feature)
     
+    def _sync_index(self) -> None:
+        """Index features appended since the last lookup."""
+        features = self.features
+        if (
+            features is not self._indexed_list
+            or len(features) < self._indexed
+            or (self._indexed and features[self._indexed - 1] is not self._last_indexed)
+        ):
+            # The list was replaced, shortened or changed at its end, so start over
+            self._by_name.clear()
+            self._by_type.clear()
+            self._indexed = 0
+            self._indexed_list = features
+        
+        for feature in features[self._indexed:]:
+            self._by_name.setdefault(feature.name, feature)
+            self._by_type.setdefault(feature.feature_type, []).append(feature)
+        self._indexed = len(features)
+        self._last_indexed = features[-1] if features else None
+    
     def get_feature(self, name: str) -> Optional[Feature]:
         """Get feature by name."""
-        for feature in self.features:
-            if feature.name == name:
-                return feature
-        return None
+        self._sync_index()
+        return self._by_name.get(name)
     
     def get_features_by_type(self, feature_type: str) -> List[Feature]:
         """Get all features of a specific type."""
-        return [f for f in self.features if f.feature_type == feature_type]
+        self._sync_index()
+        return list(self._by_type.get(feature_type, ()))
     
     def to_vector(self) -> np.ndarray:
         """Convert to a single feature vector."""
@@ -104,38 +188,48 @@ class TextFeatureExtractor(BaseExtractor):
             "hashtags": re.compile(r'#\w+'),
             "numbers": re.compile(r'\d+\.?\d*'),
         }
+        # Literal every match of a pattern contains; texts without it skip the
+        # regex scan entirely (patterns missing here are always scanned)
+        self.pattern_literals = {
+            "urls": "http",
+            "emails": "@",
+            "mentions": "@",
+            "hashtags": "#",
+        }
     
     def extract(self, text: str) -> FeatureSet:
         """Extract features from text."""
-        feature_set = FeatureSet(input_id=str(hash(text))[:8])
+        feature_set = FeatureSet(input_id=_input_id(text))
+        words = text.split()
+        word_count = len(words)
+        char_stats = _byte_stats(text)
         
         # Basic text statistics
         feature_set.add_feature(Feature("length", len(text), "numeric"))
-        feature_set.add_feature(Feature("word_count", len(text.split()), "numeric"))
-        feature_set.add_feature(Feature("sentence_count", len(text.split('.')), "numeric"))
-        feature_set.add_feature(Feature("char_count", len([c for c in text if c.isalpha()]), "numeric"))
+        feature_set.add_feature(Feature("word_count", word_count, "numeric"))
+        feature_set.add_feature(Feature("sentence_count", text.count('.') + 1, "numeric"))
+        feature_set.add_feature(Feature("char_count", char_stats["alpha"], "numeric"))
         
         # Pattern-based features
         for pattern_name, pattern in self.patterns.items():
-            matches = pattern.findall(text)
+            literal = self.pattern_literals.get(pattern_name)
+            matches = pattern.findall(text) if literal is None or literal in text else []
             feature_set.add_feature(Feature(f"{pattern_name}_count", len(matches), "numeric"))
             if matches:
                 feature_set.add_feature(Feature(f"{pattern_name}_list", matches, "categorical"))
         
         # Language-specific features
         feature_set.add_feature(Feature("avg_word_length", 
-                                       np.mean([len(word) for word in text.split()]) if text.split() else 0, 
+                                       sum(map(len, words)) / word_count if words else 0, 
                                        "numeric"))
         
         # Character-level features
-        uppercase_count = sum(1 for c in text if c.isupper())
         feature_set.add_feature(Feature("uppercase_ratio", 
-                                       uppercase_count / len(text) if text else 0, 
+                                       char_stats["upper"] / len(text) if text else 0, 
                                        "numeric"))
         
-        punctuation_count = sum(1 for c in text if c in '.,!?;:')
         feature_set.add_feature(Feature("punctuation_ratio", 
-                                       punctuation_count / len(text) if text else 0, 
+                                       char_stats["punct"] / len(text) if text else 0, 
                                        "numeric"))
         
         return feature_set
@@ -154,24 +248,42 @@ class CodeFeatureExtractor(BaseExtractor):
     
     def extract(self, code: str) -> FeatureSet:
         """Extract features from source code."""
-        feature_set = FeatureSet(input_id=str(hash(code))[:8])
+        feature_set = FeatureSet(input_id=_input_id(code))
         
         lines = code.splitlines()
         
+        # Blank, comment and indentation metrics in a single pass over lines
+        blank_lines = comment_lines = 0
+        indentations = []
+        for line in lines:
+            bare = line.lstrip()
+            if not bare:
+                blank_lines += 1
+                continue
+            if bare[0] == '#':
+                comment_lines += 1
+            indentations.append(len(line) - len(bare))
+        
         # Basic code metrics
         feature_set.add_feature(Feature("total_lines", len(lines), "numeric"))
-        feature_set.add_feature(Feature("blank_lines", len([l for l in lines if not l.strip()]), "numeric"))
-        feature_set.add_feature(Feature("comment_lines", len([l for l in lines if l.strip().startswith('#')]), "numeric"))
-        feature_set.add_feature(Feature("code_lines", len([l for l in lines if l.strip() and not l.strip().startswith('#')]), "numeric"))
+        feature_set.add_feature(Feature("blank_lines", blank_lines, "numeric"))
+        feature_set.add_feature(Feature("comment_lines", comment_lines, "numeric"))
+        feature_set.add_feature(Feature("code_lines", len(lines) - blank_lines - comment_lines, "numeric"))
         
-        # Complexity metrics
+        # Every distinct keyword across the complexity and language lists is
+        # counted once with a C-level substring scan of the lowercased source
         complexity_indicators = ["if", "elif", "else", "for", "while", "try", "except", "with"]
-        complexity_score = sum(code.lower().count(indicator) for indicator in complexity_indicators)
+        code_lower = code.lower()
+        vocabulary = dict.fromkeys(chain(complexity_indicators, *self.language_keywords.values()))
+        keyword_counts = {keyword: code_lower.count(keyword) for keyword in vocabulary}
+        
+        # Complexity metrics
+        complexity_score = sum(map(keyword_counts.__getitem__, complexity_indicators))
         feature_set.add_feature(Feature("complexity_score", complexity_score, "numeric"))
         
         # Language detection based on keywords
         for lang, keywords in self.language_keywords.items():
-            keyword_count = sum(code.lower().count(keyword) for keyword in keywords)
+            keyword_count = sum(map(keyword_counts.__getitem__, keywords))
             feature_set.add_feature(Feature(f"{lang}_keywords", keyword_count, "numeric"))
         
         # Code structure features
@@ -180,7 +292,6 @@ class CodeFeatureExtractor(BaseExtractor):
         feature_set.add_feature(Feature("import_count", code.count("import "), "numeric"))
         
         # Indentation analysis
-        indentations = [len(line) - len(line.lstrip()) for line in lines if line.strip()]
         if indentations:
             feature_set.add_feature(Feature("avg_indentation", np.mean(indentations), "numeric"))
             feature_set.add_feature(Feature("max_indentation", max(indentations), "numeric"))
@@ -196,11 +307,17 @@ class ImageFeatureExtractor(BaseExtractor):
     
     def extract(self, image_path: str) -> FeatureSet:
         """Extract features from image (mock implementation)."""
-        feature_set = FeatureSet(input_id=str(hash(image_path))[:8])
+        feature_set = FeatureSet(input_id=_input_id(image_path))
+        
+        path = Path(image_path)
+        try:
+            file_size = path.stat().st_size
+        except OSError:
+            file_size = 0
         
         # Mock features - in real implementation would use image processing
-        feature_set.add_feature(Feature("file_size", Path(image_path).stat().st_size if Path(image_path).exists() else 0, "numeric"))
-        feature_set.add_feature(Feature("file_extension", Path(image_path).suffix, "categorical"))
+        feature_set.add_feature(Feature("file_size", file_size, "numeric"))
+        feature_set.add_feature(Feature("file_extension", path.suffix, "categorical"))
         
         # Mock image properties (would extract from actual image)
         feature_set.add_feature(Feature("width", 800, "numeric"))  # Mock
@@ -225,7 +342,7 @@ class StructuredDataExtractor(BaseExtractor):
             except json.JSONDecodeError:
                 data = {"raw_string": data}
         
-        feature_set = FeatureSet(input_id=str(hash(str(data)))[:8])
+        feature_set = FeatureSet(input_id=_input_id(data))
         
         if isinstance(data, dict):
             self._extract_dict_features(data, feature_set)
@@ -287,7 +404,7 @@ class CompositeExtractor(BaseExtractor):
     
     def extract(self, input_data: Any) -> FeatureSet:
         """Extract features using all configured extractors."""
-        composite_set = FeatureSet(input_id=str(hash(str(input_data)))[:8])
+        composite_set = FeatureSet(input_id=_input_id(input_data))
         
         for extractor in self.extractors:
             try:
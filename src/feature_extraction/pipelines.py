@@ -3,7 +3,7 @@ Feature extraction pipelines.
 """
 
 from typing import List, Any
-from .extractors import BaseExtractor, FeatureSet
+from .extractors import BaseExtractor, FeatureSet, _input_id
 from .vectorizers import FeatureVectorizer
 import numpy as np
 
@@ -40,7 +40,7 @@ class FeaturePipeline:
     
     def _extract_features(self, data: Any) -> FeatureSet:
         """Extract features using all extractors."""
-        combined_fs = FeatureSet(input_id=str(hash(str(data)))[:8])
+        combined_fs = FeatureSet(input_id=_input_id(data))
         
         for extractor in self.extractors:
             try:
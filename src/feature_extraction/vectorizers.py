@@ -18,9 +18,7 @@ class FeatureVectorizer:
         """Fit vectorizer to feature sets."""
         all_features = set()
         for fs in feature_sets:
-            for feature in fs.features:
-                if feature.feature_type == "numeric":
-                    all_features.add(feature.name)
+            all_features.update(feature.name for feature in fs.get_features_by_type("numeric"))
         
         self.feature_vocab = {name: i for i, name in enumerate(sorted(all_features))}
         self.is_fitted = True
@@ -30,13 +28,17 @@ class FeatureVectorizer:
         if not self.is_fitted:
             raise ValueError("Vectorizer must be fitted first")
         
-        vectors = []
-        for fs in feature_sets:
-            vector = np.zeros(len(self.feature_vocab))
-            for feature in fs.features:
-                if feature.name in self.feature_vocab and feature.feature_type == "numeric":
-                    idx = self.feature_vocab[feature.name]
-                    vector[idx] = float(feature.value)
-            vectors.append(vector)
+        vocab = self.feature_vocab
+        vectors = np.zeros((len(feature_sets), len(vocab)))
+        for row, fs in enumerate(feature_sets):
+            # Scatter each set's numeric values into its row in one assignment;
+            # numpy leaves repeated indices unordered, so later duplicates are
+            # resolved here first
+            row_values = {}
+            for feature in fs.get_features_by_type("numeric"):
+                idx = vocab.get(feature.name)
+                if idx is not None:
+                    row_values[idx] = float(feature.value)
+            vectors[row, list(row_values)] = list(row_values.values())
         
-        return np.array(vectors)
\ No newline at end of file
+        return vectors
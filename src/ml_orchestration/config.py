@@ -4,6 +4,8 @@ Configuration system for ML training workflows.
 
 import yaml
 import json
+import copy
+import functools
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
@@ -271,6 +273,85 @@ class ExperimentConfig:
         return errors
 
 
+@functools.lru_cache(maxsize=None)
+def _builtin_templates() -> Dict[str, ExperimentConfig]:
+    """Build the built-in templates once; managers copy them, never modify these."""
+    return {
+        "text_classification": ExperimentConfig(
+            name="text_classification_template",
+            description="Template for text classification tasks",
+            model=ModelConfig(
+                architecture="transformer",
+                num_layers=6,
+                hidden_size=512,
+                num_attention_heads=8
+            ),
+            data=DataConfig(
+                batch_size=32,
+                max_length=128,
+                preprocessing=["tokenize", "truncate"]
+            ),
+            training=TrainingConfig(
+                num_epochs=5,
+                eval_steps=100,
+                save_steps=500
+            ),
+            callbacks=[
+                CallbackConfig("early_stopping"),
+                CallbackConfig("model_checkpoint")
+            ]
+        ),
+        
+        "language_modeling": ExperimentConfig(
+            name="language_modeling_template",
+            description="Template for language modeling tasks",
+            model=ModelConfig(
+                architecture="gpt",
+                num_layers=12,
+                hidden_size=768,
+                num_attention_heads=12
+            ),
+            data=DataConfig(
+                batch_size=16,
+                max_length=512,
+                preprocessing=["tokenize"]
+            ),
+            training=TrainingConfig(
+                num_epochs=10,
+                gradient_accumulation_steps=4,
+                eval_steps=500
+            ),
+            optimizer=OptimizerConfig(
+                learning_rate=5e-5,
+                weight_decay=0.01
+            )
+        ),
+        
+        "fine_tuning": ExperimentConfig(
+            name="fine_tuning_template", 
+            description="Template for fine-tuning pre-trained models",
+            model=ModelConfig(
+                pretrained_path="bert-base-uncased"
+            ),
+            data=DataConfig(
+                batch_size=16,
+                max_length=256
+            ),
+            training=TrainingConfig(
+                num_epochs=3,
+                eval_steps=100
+            ),
+            optimizer=OptimizerConfig(
+                learning_rate=2e-5
+            ),
+            scheduler=SchedulerConfig(
+                type=SchedulerType.LINEAR,
+                warmup_steps=100
+            )
+        )
+    }
+
+
 class ConfigManager:
     """Manages experiment configurations and templates."""
     
@@ -282,80 +363,9 @@ class ConfigManager:
     
     def _load_templates(self) -> None:
         """Load configuration templates."""
-        self._templates = {
-            "text_classification": ExperimentConfig(
-                name="text_classification_template",
-                description="Template for text classification tasks",
-                model=ModelConfig(
-                    architecture="transformer",
-                    num_layers=6,
-                    hidden_size=512,
-                    num_attention_heads=8
-                ),
-                data=DataConfig(
-                    batch_size=32,
-                    max_length=128,
-                    preprocessing=["tokenize", "truncate"]
-                ),
-                training=TrainingConfig(
-                    num_epochs=5,
-                    eval_steps=100,
-                    save_steps=500
-                ),
-                callbacks=[
-                    CallbackConfig("early_stopping"),
-                    CallbackConfig("model_checkpoint")
-                ]
-            ),
-            
-            "language_modeling": ExperimentConfig(
-                name="language_modeling_template",
-                description="Template for language modeling tasks",
-                model=ModelConfig(
-                    architecture="gpt",
-                    num_layers=12,
-                    hidden_size=768,
-                    num_attention_heads=12
-                ),
-                data=DataConfig(
-                    batch_size=16,
-                    max_length=512,
-                    preprocessing=["tokenize"]
-                ),
-                training=TrainingConfig(
-                    num_epochs=10,
-                    gradient_accumulation_steps=4,
-                    eval_steps=500
-                ),
-                optimizer=OptimizerConfig(
-                    learning_rate=5e-5,
-                    weight_decay=0.01
-                )
-            ),
-            
-            "fine_tuning": ExperimentConfig(
-                name="fine_tuning_template", 
-                description="Template for fine-tuning pre-trained models",
-                model=ModelConfig(
-                    pretrained_path="bert-base-uncased"
-                ),
-                data=DataConfig(
-                    batch_size=16,
-                    max_length=256
-                ),
-                training=TrainingConfig(
-                    num_epochs=3,
-                    eval_steps=100
-                ),
-                optimizer=OptimizerConfig(
-                    learning_rate=2e-5
-                ),
-                scheduler=SchedulerConfig(
-                    type=SchedulerType.LINEAR,
-                    warmup_steps=100
-                )
-            )
-        }
+        # Templates are mutable, so each manager gets its own copies of the
+        # cached originals
+        self._templates = copy.deepcopy(_builtin_templates())
     
     def get_template(self, template_name: str) -> Optional[ExperimentConfig]:
         """Get a configuration template."""
@@ -3,12 +3,21 @@ Core NLP capabilities and component definitions.
 """
 
 from abc import ABC, abstractmethod
+import functools
 from typing import Dict, List, Optional, Any, Set, Union, Callable
 from dataclasses import dataclass, field
 from enum import Enum
+import re
 import uuid
 
 
+# Patterns shared by every document the capabilities process
+TOKEN_PATTERN = re.compile(r'\S+')
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PERSON_PATTERN = re.compile(r'\b[A-Z][a-z]+ [A-Z][a-z]+\b')
+
+
 class CapabilityLevel(Enum):
     """Hierarchical levels of NLP capabilities."""
     CORE = "core"           # Basic text processing
@@ -123,15 +132,8 @@ class TokenizerCapability(BaseCapability):
     def process(self, doc: Document) -> Document:
         """Tokenize the document text."""
         # Simple whitespace tokenization (in practice would use more sophisticated methods)
-        tokens = doc.text.split()
-        token_spans = []
-        
-        current_pos = 0
-        for token in tokens:
-            start = doc.text.find(token, current_pos)
-            end = start + len(token)
-            token_spans.append((start, end, token))
-            current_pos = end
+        token_spans = [(m.start(), m.end(), m.group()) for m in TOKEN_PATTERN.finditer(doc.text)]
+        tokens = [token for _, _, token in token_spans]
         
         doc.add_annotation("tokens", tokens)
         doc.add_annotation("token_spans", token_spans)
@@ -154,10 +156,7 @@ class SentenceSplitterCapability(BaseCapability):
     def process(self, doc: Document) -> Document:
         """Split document into sentences."""
         # Simple sentence splitting (in practice would be more sophisticated)
-        import re
-        
-        sentence_endings = re.compile(r'[.!?]+')
-        sentences = sentence_endings.split(doc.text)
+        sentences = SENTENCE_END_PATTERN.split(doc.text)
         sentences = [s.strip() for s in sentences if s.strip()]
         
         # Calculate spans
@@ -230,13 +229,10 @@ class NERCapability(BaseCapability):
     def process(self, doc: Document) -> Document:
         """Extract named entities."""
         # Mock NER (in practice would use trained models)
-        import re
-        
         entities = []
         
         # Simple pattern-based entity extraction
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        for match in re.finditer(email_pattern, doc.text):
+        for match in EMAIL_PATTERN.finditer(doc.text):
             entities.append({
                 "text": match.group(),
                 "start": match.start(),
@@ -245,8 +241,7 @@ class NERCapability(BaseCapability):
             })
         
         # Mock person names (simple capitalized words)
-        person_pattern = r'\b[A-Z][a-z]+ [A-Z][a-z]+\b'
-        for match in re.finditer(person_pattern, doc.text):
+        for match in PERSON_PATTERN.finditer(doc.text):
             entities.append({
                 "text": match.group(),
                 "start": match.start(),
@@ -372,8 +367,6 @@ class CodeAnalysisCapability(BaseCapability):
         }
         
         # Extract functions and classes (simple pattern matching)
-        import re
-        
         functions = []
         for match in re.finditer(r'def\s+(\w+)\s*\(([^)]*)\):', text):
             functions.append({
@@ -414,8 +407,6 @@ class LegalTextCapability(BaseCapability):
         text = doc.text
         
         # Extract legal entities (mock patterns)
-        import re
-        
         legal_entities = []
         
         # Contract parties
@@ -456,6 +447,37 @@ class LegalTextCapability(BaseCapability):
         return doc
 
 
+_LEVEL_ORDER = list(CapabilityLevel)
+
+
+class CompositeCapability(BaseCapability):
+    """Runs several capabilities over a document as a single capability."""
+    
+    def __init__(self, stages: List[BaseCapability]):
+        metadata = CapabilityMetadata(
+            name="pipeline:" + ",".join(stage.metadata.name for stage in stages),
+            description="Applies " + ", ".join(stage.metadata.name for stage in stages),
+            level=max((stage.metadata.level for stage in stages), key=_LEVEL_ORDER.index, default=CapabilityLevel.CORE),
+            stage=ProcessingStage.ANALYSIS,
+            languages=set().union(*(stage.metadata.languages for stage in stages)),
+            outputs=set().union(*(stage.metadata.outputs for stage in stages)),
+            computational_cost=sum(stage.metadata.computational_cost for stage in stages)
+        )
+        super().__init__(metadata)
+        self.stages = stages
+    
+    def can_process(self, doc: Document) -> bool:
+        """Check if any stage can process the document."""
+        return any(stage.can_process(doc) for stage in self.stages)
+    
+    def process(self, doc: Document) -> Document:
+        """Apply each stage that can process the document, in order."""
+        for stage in self.stages:
+            if stage.can_process(doc):
+                doc = stage.process(doc)
+        return doc
+
+
 # Registry of all available capabilities
 CAPABILITY_REGISTRY = {
     "tokenizer": TokenizerCapability,
@@ -470,13 +492,25 @@ CAPABILITY_REGISTRY = {
 
 
 def get_capability(name: str) -> Optional[BaseCapability]:
-    """Get a capability instance by name."""
+    """Get a new capability instance by name, or a composite for "pipeline:a,b,..."."""
+    if name.startswith("pipeline:"):
+        stages = [get_capability(stage_name.strip()) for stage_name in name[len("pipeline:"):].split(",")]
+        if not stages or None in stages:
+            return None
+        return CompositeCapability(stages)
+    
     capability_class = CAPABILITY_REGISTRY.get(name)
     if capability_class:
         return capability_class()
     return None
 
 
+@functools.lru_cache(maxsize=None)
+def _capability_level(capability_class: type) -> CapabilityLevel:
+    """Level of a capability class, read from one throwaway instance."""
+    return capability_class().metadata.level
+
+
 def list_capabilities() -> List[str]:
     """List all available capability names."""
     return list(CAPABILITY_REGISTRY.keys())
@@ -486,7 +520,6 @@ def get_capabilities_by_level(level: CapabilityLevel) -> List[str]:
     """Get capabilities filtered by level."""
     capabilities = []
     for name, capability_class in CAPABILITY_REGISTRY.items():
-        instance = capability_class()
-        if instance.metadata.level == level:
+        if _capability_level(capability_class) == level:
             capabilities.append(name)
     return capabilities
\ No newline at end of file
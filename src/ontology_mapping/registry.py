@@ -2,7 +2,7 @@
 Component registry with tag-based discovery and filtering.
 """
 
-from typing import Dict, List, Optional, Set, Callable, Any, Type
+from typing import Dict, List, Optional, Set, Callable, Any, Type, Tuple
 from dataclasses import dataclass
 import inspect
 from .tags import ComponentTags, TagType, create_component_tags
@@ -24,6 +24,9 @@ class ComponentRegistry:
     def __init__(self):
         self._components: Dict[str, ComponentInfo] = {}
         self._by_tag: Dict[str, Set[str]] = {}
+        # (tag name, value) -> component names, in registration order
+        self._by_value: Dict[Tuple[str, Any], Dict[str, None]] = {}
+        self._matrix: Optional[Dict[str, Dict[str, Any]]] = None
     
     def register(
         self, 
@@ -43,13 +46,21 @@ class ComponentRegistry:
             description=description or component_class.__doc__
         )
         
+        if name in self._components:
+            self.unregister(name)
+        
         self._components[name] = info
+        self._matrix = None
         
         # Update tag index
-        for tag_name in tags.tags.keys():
+        for tag_name, tag_value in tags.tags.items():
             if tag_name not in self._by_tag:
                 self._by_tag[tag_name] = set()
             self._by_tag[tag_name].add(name)
+            
+            key = _value_key(tag_name, tag_value)
+            if key is not None:
+                self._by_value.setdefault(key, {})[name] = None
     
     def unregister(self, name: str) -> None:
         """Unregister a component."""
@@ -59,13 +70,20 @@ class ComponentRegistry:
         info = self._components[name]
         
         # Remove from tag index
-        for tag_name in info.tags.tags.keys():
+        for tag_name, tag_value in info.tags.tags.items():
             if tag_name in self._by_tag:
                 self._by_tag[tag_name].discard(name)
                 if not self._by_tag[tag_name]:
                     del self._by_tag[tag_name]
+            
+            key = _value_key(tag_name, tag_value)
+            if key in self._by_value:
+                self._by_value[key].pop(name, None)
+                if not self._by_value[key]:
+                    del self._by_value[key]
         
         del self._components[name]
+        self._matrix = None
     
     def get(self, name: str) -> Optional[ComponentInfo]:
         """Get component info by name."""
@@ -80,6 +98,11 @@ class ComponentRegistry:
         if tag_name not in self._by_tag:
             return []
         
+        if tag_value is not None:
+            key = _value_key(tag_name, tag_value)
+            if key is not None:
+                return [self._components[name] for name in self._by_value.get(key, ())]
+        
         candidates = [self._components[name] for name in self._by_tag[tag_name]]
         
         if tag_value is not None:
@@ -101,10 +124,16 @@ class ComponentRegistry:
         
         # Filter by remaining criteria
         for tag_name, tag_value in list(criteria.items())[1:]:
-            candidates = [
-                info for info in candidates
-                if info.tags.get_tag(tag_name) == tag_value
-            ]
+            key = _value_key(tag_name, tag_value) if tag_value is not None else None
+            
+            if key is not None:
+                matching = self._by_value.get(key, {})
+                candidates = [info for info in candidates if info.name in matching]
+            else:
+                candidates = [
+                    info for info in candidates
+                    if info.tags.get_tag(tag_name) == tag_value
+                ]
         
         return candidates
     
@@ -145,6 +174,12 @@ class ComponentRegistry:
     
     def get_capabilities_matrix(self) -> Dict[str, Dict[str, Any]]:
         """Get a matrix of all components and their capabilities."""
+        if self._matrix is None:
+            self._matrix = self._build_capabilities_matrix()
+        
+        return {name: dict(caps) for name, caps in self._matrix.items()}
+    
+    def _build_capabilities_matrix(self) -> Dict[str, Dict[str, Any]]:
         matrix = {}
         capability_tags = set()
         
@@ -162,6 +197,15 @@ class ComponentRegistry:
         return matrix
 
 
+def _value_key(tag_name: str, tag_value: Any) -> Optional[Tuple[str, Any]]:
+    """Key for the value index, or None for unhashable values like lists."""
+    try:
+        hash(tag_value)
+    except TypeError:
+        return None
+    return (tag_name, tag_value)
+
+
 # Global component registry
 _component_registry = ComponentRegistry()
 
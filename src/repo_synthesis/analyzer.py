@@ -75,6 +75,10 @@ class CodeAnalyzer:
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
+        return self.analyze_source(content, file_path)
+    
+    def analyze_source(self, content: str, file_path: str = "<string>") -> FileInfo:
+        """Analyze Python source held in memory, reported under file_path."""
         try:
             tree = ast.parse(content)
         except SyntaxError as e:
@@ -0,0 +1,43 @@
+/*
+  # Add Command Statistics Aggregate Function
+
+  1. Functions
+    - `get_command_stats` - aggregates a Discord user's recent command history
+      - Parameters:
+        - `p_discord_id` (text) - the user's Discord id
+        - `p_limit` (int) - number of most recent commands to aggregate
+      - Returns: one row per command type with command, suggested and accepted counts
+
+  2. Notes
+    - Resolves the Discord id to the user uuid inside the query
+    - Replaces fetching up to 1000 history rows and counting them in the bot
+*/
+
+CREATE OR REPLACE FUNCTION get_command_stats(
+  p_discord_id text,
+  p_limit int DEFAULT 1000
+)
+RETURNS TABLE (
+  command_type text,
+  command_count bigint,
+  suggested_count bigint,
+  accepted_count bigint
+)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT
+    COALESCE(recent.command_type, 'unknown') AS command_type,
+    count(*) AS command_count,
+    count(*) FILTER (WHERE recent.was_suggested) AS suggested_count,
+    count(*) FILTER (WHERE recent.accepted_suggestion) AS accepted_count
+  FROM (
+    SELECT command_history.*
+    FROM command_history
+    JOIN discord_users ON discord_users.id = command_history.user_id
+    WHERE discord_users.discord_id = p_discord_id
+    ORDER BY command_history.created_at DESC
+    LIMIT p_limit
+  ) AS recent
+  GROUP BY COALESCE(recent.command_type, 'unknown');
+$$;
@@ -0,0 +1,41 @@
+/*
+  # Add KB Document Delete Function
+
+  1. Functions
+    - `delete_kb_document` - deletes one of a Discord user's KB documents and its chunks
+      - Parameters:
+        - `p_discord_id` (text) - the owner's Discord id
+        - `p_file_name` (text) - the document file name
+      - Returns: true if a document was deleted, false if none matched
+
+  2. Notes
+    - Resolves the owner and deletes chunks and document in a single transaction
+    - Replaces three separate round trips from the Discord bot
+*/
+
+CREATE OR REPLACE FUNCTION delete_kb_document(
+  p_discord_id text,
+  p_file_name text
+)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  doc_ids uuid[];
+BEGIN
+  SELECT array_agg(kb_documents.id) INTO doc_ids
+  FROM kb_documents
+  JOIN discord_users ON discord_users.id = kb_documents.user_id
+  WHERE discord_users.discord_id = p_discord_id
+    AND kb_documents.file_name = p_file_name;
+
+  IF doc_ids IS NULL THEN
+    RETURN false;
+  END IF;
+
+  DELETE FROM kb_chunks WHERE document_id = ANY(doc_ids);
+  DELETE FROM kb_documents WHERE id = ANY(doc_ids);
+
+  RETURN true;
+END;
+$$;
@@ -0,0 +1,24 @@
+/*
+  # Add KB Document Size Column
+
+  1. Schema Changes
+    - Add `size_bytes` to kb_documents, populated by the Discord bot on upload
+    - Backfill existing rows from the stored content
+
+  2. Notes
+    - Lets /kb-list show document sizes without selecting the content column
+*/
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM information_schema.columns
+    WHERE table_name = 'kb_documents' AND column_name = 'size_bytes'
+  ) THEN
+    ALTER TABLE kb_documents ADD COLUMN size_bytes integer DEFAULT 0;
+  END IF;
+END $$;
+
+UPDATE kb_documents
+SET size_bytes = octet_length(content)
+WHERE size_bytes IS NULL OR size_bytes = 0;
@@ -0,0 +1,53 @@
+/*
+  # Add Batched Command Pattern Recording Function
+
+  1. Functions
+    - `record_command_patterns` - records a batch of observed command patterns
+      - Parameters:
+        - `p_patterns` (jsonb) - array of objects with `discord_id`, `pattern_name`,
+          `command_sequence`, `trigger_context` and `occurrences`
+      - Returns: void
+
+  2. Notes
+    - Existing patterns have their frequency raised by `occurrences` and `last_used` touched
+    - New patterns are inserted with `frequency` set to `occurrences`
+    - Lets the Discord bot flush buffered pattern updates in one round trip
+*/
+
+CREATE OR REPLACE FUNCTION record_command_patterns(p_patterns jsonb)
+RETURNS void
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  pattern jsonb;
+  uid uuid;
+BEGIN
+  FOR pattern IN SELECT * FROM jsonb_array_elements(p_patterns)
+  LOOP
+    SELECT id INTO uid FROM discord_users WHERE discord_id = pattern->>'discord_id';
+
+    IF uid IS NULL THEN
+      CONTINUE;
+    END IF;
+
+    UPDATE command_patterns
+    SET frequency = frequency + (pattern->>'occurrences')::int,
+        last_used = now()
+    WHERE user_id = uid AND pattern_name = pattern->>'pattern_name';
+
+    IF NOT FOUND THEN
+      -- Populate through the table's row type so the array columns are
+      -- coerced from JSON whatever their declared type
+      INSERT INTO command_patterns (user_id, pattern_name, trigger_context, command_sequence, frequency)
+      SELECT row.user_id, row.pattern_name, row.trigger_context, row.command_sequence, row.frequency
+      FROM jsonb_populate_record(NULL::command_patterns, jsonb_build_object(
+        'user_id', uid,
+        'pattern_name', pattern->>'pattern_name',
+        'trigger_context', pattern->'trigger_context',
+        'command_sequence', pattern->'command_sequence',
+        'frequency', (pattern->>'occurrences')::int
+      )) AS row;
+    END IF;
+  END LOOP;
+END;
+$$;
@@ -0,0 +1,34 @@
+/*
+  # Add Clear User History Function
+
+  1. Functions
+    - `clear_user_history` - deletes a Discord user's command history, patterns and suggestions
+      - Parameters:
+        - `p_discord_id` (text) - the user's Discord id
+      - Returns: true if the user exists, false otherwise
+
+  2. Notes
+    - All three deletes run in one transaction, so a failure leaves nothing half-cleared
+    - Replaces four separate round trips from the Discord bot
+*/
+
+CREATE OR REPLACE FUNCTION clear_user_history(p_discord_id text)
+RETURNS boolean
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  uid uuid;
+BEGIN
+  SELECT id INTO uid FROM discord_users WHERE discord_id = p_discord_id;
+
+  IF uid IS NULL THEN
+    RETURN false;
+  END IF;
+
+  DELETE FROM command_history WHERE user_id = uid;
+  DELETE FROM command_patterns WHERE user_id = uid;
+  DELETE FROM command_suggestions WHERE user_id = uid;
+
+  RETURN true;
+END;
+$$;
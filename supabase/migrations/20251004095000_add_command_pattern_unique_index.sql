@@ -0,0 +1,19 @@
+/*
+  # Add Unique Command Pattern Index
+
+  1. Schema Changes
+    - Remove duplicate (user_id, pattern_name) rows in command_patterns, keeping the most frequent
+    - Add unique index `idx_command_patterns_user_pattern` on (user_id, pattern_name)
+
+  2. Notes
+    - Lets the Discord bot record a pattern with a single INSERT ... ON CONFLICT statement
+*/
+
+DELETE FROM command_patterns a
+USING command_patterns b
+WHERE a.user_id = b.user_id
+  AND a.pattern_name = b.pattern_name
+  AND (a.frequency < b.frequency OR (a.frequency = b.frequency AND a.id < b.id));
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_command_patterns_user_pattern
+  ON command_patterns(user_id, pattern_name);
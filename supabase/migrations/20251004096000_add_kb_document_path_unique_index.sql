@@ -0,0 +1,25 @@
+/*
+  # Add Unique KB Document Path Index
+
+  1. Schema Changes
+    - Remove duplicate (user_id, file_path) rows in kb_documents and their chunks,
+      keeping the most recently updated document
+    - Add unique index `idx_kb_documents_user_path` on (user_id, file_path)
+
+  2. Notes
+    - Lets the Discord bot store a KB document with a single INSERT ... ON CONFLICT statement
+*/
+
+CREATE TEMP TABLE duplicate_kb_documents ON COMMIT DROP AS
+SELECT a.id
+FROM kb_documents a
+JOIN kb_documents b
+  ON a.user_id = b.user_id
+  AND a.file_path = b.file_path
+  AND (a.updated_at < b.updated_at OR (a.updated_at = b.updated_at AND a.id < b.id));
+
+DELETE FROM kb_chunks WHERE document_id IN (SELECT id FROM duplicate_kb_documents);
+DELETE FROM kb_documents WHERE id IN (SELECT id FROM duplicate_kb_documents);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_kb_documents_user_path
+  ON kb_documents(user_id, file_path);
@@ -0,0 +1,19 @@
+/*
+  # Add Trigram Index on KB Chunk Content
+
+  1. Extensions
+    - Enable `pg_trgm`
+
+  2. Indexes
+    - `idx_kb_chunks_content_trgm` - GIN trigram index on kb_chunks.content
+
+  3. Notes
+    - Lets the Discord bot's `content ILIKE '%query%'` KB search use an index
+      instead of scanning every chunk
+    - Also provides `similarity()`, which the bot uses to rank matching chunks
+*/
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_kb_chunks_content_trgm
+  ON kb_chunks USING gin (content gin_trgm_ops);
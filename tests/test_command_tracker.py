@@ -0,0 +1,138 @@
+"""
+Tests for command classification and pattern tracking.
+"""
+
+import asyncio
+
+import pytest
+
+from discord_bot.command_tracker import COMMAND_TYPES, CommandTracker
+
+
+def reference_classify(command_text: str) -> str:
+    """The original prefix-chain classifier."""
+    command_lower = command_text.lower().strip()
+
+    if command_lower.startswith(('git ', 'gh ')):
+        return 'git'
+    elif command_lower.startswith(('npm ', 'yarn ', 'pnpm ', 'npx ')):
+        return 'package_manager'
+    elif command_lower.startswith(('cd ', 'ls ', 'mkdir ', 'rm ', 'mv ', 'cp ')):
+        return 'filesystem'
+    elif command_lower.startswith(('python ', 'pip ', 'pytest ')):
+        return 'python'
+    elif command_lower.startswith(('node ', 'deno ')):
+        return 'javascript'
+    elif command_lower.startswith(('docker ', 'kubectl ')):
+        return 'containers'
+    elif command_lower.startswith('!'):
+        return 'bot_command'
+    else:
+        return 'unknown'
+
+
+COMMANDS = [
+    *(f"{program} run" for program in COMMAND_TYPES),
+    *(f"  {program.upper()}  x  " for program in COMMAND_TYPES),
+    *COMMAND_TYPES,
+    "git",
+    "git\tstatus",
+    "gitk --all",
+    "github open",
+    "cdk deploy",
+    "npm",
+    "!suggest",
+    "!git status",
+    "! ",
+    "",
+    "   ",
+    "make test",
+    "echo git status",
+    "ls",
+    "ls -la",
+]
+
+
+@pytest.mark.parametrize("command_text", COMMANDS)
+def test_classification_matches_original_prefix_checks(command_text):
+    """The program lookup table classifies exactly like the old prefix chain."""
+    assert CommandTracker._classify_command(command_text) == reference_classify(command_text)
+
+
+class PatternTable:
+    """In-memory command_patterns table with the bot's two ways of writing it."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def update_command_pattern(self, user_id, pattern_name, command_sequence, trigger_context):
+        """Per-command upsert, as the tracker used to issue."""
+        row = self.rows.get((user_id, pattern_name))
+        if row:
+            row["frequency"] += 1
+        else:
+            self.rows[(user_id, pattern_name)] = {
+                "command_sequence": command_sequence,
+                "trigger_context": trigger_context,
+                "frequency": 1,
+            }
+
+    async def record_command_patterns(self, patterns):
+        """Batched upsert, mirroring the record_command_patterns SQL function."""
+        for pattern in patterns:
+            key = (pattern["discord_id"], pattern["pattern_name"])
+            row = self.rows.get(key)
+            if row:
+                row["frequency"] += pattern["occurrences"]
+            else:
+                self.rows[key] = {
+                    "command_sequence": pattern["command_sequence"],
+                    "trigger_context": pattern["trigger_context"],
+                    "frequency": pattern["occurrences"],
+                }
+
+
+def reference_update_patterns(table: PatternTable, user_id, command_text, context):
+    """The original unbuffered pattern update."""
+    if len(context) < 2:
+        return
+
+    recent_commands = [cmd["command_text"] for cmd in context[-3:]]
+    recent_commands.append(command_text)
+    pattern_signature = "->".join(reference_classify(cmd) for cmd in recent_commands)
+    trigger_context = [cmd["command_text"] for cmd in context[-2:]]
+
+    table.update_command_pattern(user_id, pattern_signature, recent_commands, trigger_context)
+
+
+def test_buffered_patterns_match_per_command_updates():
+    """Flushing buffered patterns leaves the same rows as updating on every command."""
+    commands = [
+        ("alice", "git status"), ("alice", "git add ."), ("alice", "git commit -m x"),
+        ("bob", "npm install"), ("alice", "git push"), ("bob", "npm test"),
+        ("alice", "git status"), ("bob", "npm run build"), ("alice", "git add ."),
+        ("alice", "git commit -m y"), ("alice", "ls -la"), ("bob", "npm test"),
+    ]
+
+    async def scenario():
+        expected = PatternTable()
+        actual = PatternTable()
+        tracker = CommandTracker(actual, flush_interval=3600)
+        history = {}
+
+        for i, (user_id, command_text) in enumerate(commands):
+            context = history.setdefault(user_id, [])
+            reference_update_patterns(expected, user_id, command_text, list(context))
+            await tracker._update_patterns(user_id, command_text, list(context))
+            context.append({"command_text": command_text})
+            if i == len(commands) // 2:
+                await tracker.flush_patterns()
+
+        await tracker.flush_patterns()
+        tracker._flush_task.cancel()
+        return expected.rows, actual.rows
+
+    expected, actual = asyncio.run(scenario())
+
+    assert actual == expected
+    assert max(row["frequency"] for row in actual.values()) > 1
@@ -0,0 +1,172 @@
+"""
+Tests for DAG execution scheduling.
+"""
+
+import asyncio
+
+import networkx as nx
+import pytest
+
+from src.dag_execution.dag import DAG
+from src.dag_execution.node import ExecutionContext, FunctionNode, NodeState
+
+
+def run(dag: DAG, **kwargs):
+    """Execute a DAG to completion with a fresh context."""
+    return asyncio.run(dag.execute(ExecutionContext("test_run", execution_time=0.0), **kwargs))
+
+
+def test_diamond_dependencies():
+    """A node with two parents runs once, after both of them."""
+    calls = []
+
+    async def source():
+        calls.append("source")
+        return 1
+
+    async def left(result):
+        calls.append("left")
+        return result + 1
+
+    async def right(result):
+        calls.append("right")
+        return result * 10
+
+    async def sink():
+        calls.append("sink")
+        return sorted(calls)
+
+    dag = DAG("diamond")
+    for func in (source, left, right, sink):
+        dag.add_node(FunctionNode(func, func.__name__))
+    dag.add_edge("source", "left")
+    dag.add_edge("source", "right")
+    dag.add_edge("left", "sink")
+    dag.add_edge("right", "sink")
+
+    results = run(dag)
+
+    assert all(result.state == NodeState.COMPLETED for result in results.values())
+    assert results["left"].outputs == {"result": 2}
+    assert results["right"].outputs == {"result": 10}
+    assert results["sink"].outputs == {"result": ["left", "right", "sink", "source"]}
+    assert calls[0] == "source"
+    assert calls.count("sink") == 1
+
+
+def test_failure_skips_downstream_only():
+    """A failed node skips everything below it while independent branches finish."""
+
+    async def ok():
+        return {}
+
+    async def slow():
+        await asyncio.sleep(0.02)
+        return {}
+
+    async def broken():
+        raise ValueError("boom")
+
+    dag = DAG("failure")
+    dag.add_node(FunctionNode(ok, "root"))
+    dag.add_node(FunctionNode(broken, "broken"))
+    # Still running when the failure is handled
+    dag.add_node(FunctionNode(slow, "sibling"))
+    for node_id in ("child", "grandchild", "sibling_child"):
+        dag.add_node(FunctionNode(ok, node_id))
+    dag.add_edge("root", "broken")
+    dag.add_edge("broken", "child")
+    dag.add_edge("child", "grandchild")
+    dag.add_edge("root", "sibling")
+    dag.add_edge("sibling", "sibling_child")
+
+    results = run(dag)
+    states = {node_id: result.state for node_id, result in results.items()}
+
+    assert states == {
+        "root": NodeState.COMPLETED,
+        "broken": NodeState.FAILED,
+        "child": NodeState.SKIPPED,
+        "grandchild": NodeState.SKIPPED,
+        "sibling": NodeState.COMPLETED,
+        "sibling_child": NodeState.COMPLETED,
+    }
+    assert "broken" in results["child"].error
+    assert "broken" in results["grandchild"].error
+
+
+def test_max_parallel_bounds_running_nodes():
+    """No more than max_parallel nodes run at once."""
+    running = 0
+    peak = 0
+
+    async def work():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {}
+
+    dag = DAG("bounded")
+    for i in range(6):
+        dag.add_node(FunctionNode(work, f"worker_{i}"))
+    dag.add_node(FunctionNode(work, "join"))
+    for i in range(6):
+        dag.add_edge(f"worker_{i}", "join")
+
+    results = run(dag, max_parallel=2)
+
+    assert len(results) == 7
+    assert peak == 2
+
+
+def test_nodes_wrapping_one_function_get_their_own_inputs():
+    """Editing one node's input specs leaves other nodes on the same function alone."""
+
+    async def scale(value: int, factor: int = 2) -> int:
+        return value * factor
+
+    first = FunctionNode(scale, "first")
+    second = FunctionNode(scale, "second")
+    first.inputs["factor"].default_value = 3
+    first.outputs["result"].description = "scaled"
+
+    assert first.inputs["value"] is not second.inputs["value"]
+    assert second.inputs["factor"].default_value == 2
+    assert second.outputs["result"].description is None
+    assert [(i.name, i.data_type, i.required) for i in second.inputs.values()] == [
+        ("value", int, True),
+        ("factor", int, False),
+    ]
+
+
+def test_cycles_are_rejected():
+    """Edges closing a cycle are refused, and validate still reports cycles."""
+
+    async def step():
+        return {}
+
+    dag = DAG("cyclic")
+    for node_id in ("a", "b", "c"):
+        dag.add_node(FunctionNode(step, node_id))
+    dag.add_edge("a", "b")
+    dag.add_edge("b", "c")
+
+    with pytest.raises(ValueError, match="cycle"):
+        dag.add_edge("c", "a")
+    with pytest.raises(ValueError, match="cycle"):
+        dag.bulk_add_edges([("a", "c"), ("c", "a")])
+
+    assert dag.edges() == [("a", "b"), ("b", "c")]
+    assert dag.validate() == []
+    assert nx.is_directed_acyclic_graph(dag.graph)
+
+    # Adjacency edited without going through the DAG
+    dag._successors["c"]["a"] = None
+    dag._predecessors["a"]["c"] = None
+    dag._structure_changed()
+
+    assert "DAG contains cycles" in dag.validate()
+    with pytest.raises(ValueError, match="validation failed"):
+        run(dag)
@@ -0,0 +1,122 @@
+"""
+Tests for the discord bot's in-process TTL cache.
+"""
+
+import pytest
+
+from discord_bot import cache as cache_module
+from discord_bot.cache import TTLCache
+
+
+class FakeClock:
+    """Stands in for the time module so tests control expiry."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def test_entries_expire_after_ttl(clock):
+    """Values are served until their TTL passes, then dropped."""
+    cache = TTLCache(ttl=10)
+    cache.set("key", "value")
+
+    clock.now += 10
+    assert cache.get("key") == "value"
+
+    clock.now += 0.5
+    assert cache.get("key") is None
+    assert "key" not in cache._entries
+
+
+def test_set_refreshes_expiry(clock):
+    """Writing a key again restarts its TTL."""
+    cache = TTLCache(ttl=10)
+    cache.set("key", 1)
+    clock.now += 8
+    cache.set("key", 2)
+    clock.now += 8
+
+    assert cache.get("key") == 2
+
+
+def test_full_cache_evicts_expired_entries_first(clock):
+    """At maxsize, expired entries make room before live ones are dropped."""
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("old", 1)
+    clock.now += 5
+    cache.set("live", 2)
+    clock.now += 6
+
+    cache.set("new", 3)
+
+    assert cache.get("live") == 2
+    assert cache.get("new") == 3
+    assert "old" not in cache._entries
+
+
+def test_full_cache_evicts_oldest_write(clock):
+    """With nothing expired, the oldest write is dropped."""
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("first", 1)
+    cache.set("second", 2)
+    cache.set("third", 3)
+
+    assert cache.get("first") is None
+    assert cache.get("second") == 2
+    assert cache.get("third") == 3
+
+
+def test_invalidate_and_clear(clock):
+    """Entries can be dropped one at a time or all together."""
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert cache.get("b") is None
+
+
+def test_filling_past_maxsize_evicts_oldest_writes(clock):
+    """Overfilling drops the least recently written keys, counting rewrites."""
+    cache = TTLCache(ttl=10, maxsize=3)
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+        clock.now += 1
+    cache.set("a", "a2")
+
+    for key in ("d", "e"):
+        cache.set(key, key)
+
+    assert list(cache._entries) == ["a", "d", "e"]
+    assert cache.get("a") == "a2"
+    assert cache.get("b") is None
+    assert cache.get("c") is None
+
+
+def test_eviction_drops_every_expired_entry(clock):
+    """All expired entries at the front go, even when only one slot is needed."""
+    cache = TTLCache(ttl=10, maxsize=3)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    clock.now += 5
+    cache.set("c", 3)
+    clock.now += 6
+
+    cache.set("d", 4)
+
+    assert list(cache._entries) == ["c", "d"]
@@ -0,0 +1,122 @@
+"""
+Tests for feature sets and vectorization.
+"""
+
+import numpy as np
+import pytest
+
+from src.feature_extraction.extractors import Feature, FeatureSet
+from src.feature_extraction.vectorizers import FeatureVectorizer
+
+
+def scan_feature(fs: FeatureSet, name: str):
+    """First feature with a name, found the way lookups did before the index."""
+    for feature in fs.features:
+        if feature.name == name:
+            return feature
+    return None
+
+
+def scan_by_type(fs: FeatureSet, feature_type: str):
+    """Features of a type, found the way lookups did before the index."""
+    return [f for f in fs.features if f.feature_type == feature_type]
+
+
+def assert_lookups_match_scan(fs: FeatureSet):
+    names = {f.name for f in fs.features} | {"missing"}
+    types = {f.feature_type for f in fs.features} | {"missing"}
+    for name in names:
+        assert fs.get_feature(name) is scan_feature(fs, name)
+    for feature_type in types:
+        found = fs.get_features_by_type(feature_type)
+        expected = scan_by_type(fs, feature_type)
+        assert len(found) == len(expected)
+        assert all(a is b for a, b in zip(found, expected))
+
+
+def test_feature_lookups_follow_list_changes():
+    """Indexed lookups agree with a scan however the feature list changes."""
+    fs = FeatureSet("input")
+    assert_lookups_match_scan(fs)
+
+    fs.add_feature(Feature("length", 10, "numeric"))
+    fs.add_feature(Feature("language", "en", "categorical"))
+    assert_lookups_match_scan(fs)
+
+    # Straight to the list, including a duplicate name
+    fs.features.append(Feature("length", 99, "numeric"))
+    fs.features.extend([Feature("words", 2, "numeric"), Feature("tags", ["a"], "list")])
+    assert_lookups_match_scan(fs)
+    assert fs.get_feature("length").value == 10
+
+    fs.features.pop(0)
+    assert_lookups_match_scan(fs)
+    assert fs.get_feature("length").value == 99
+
+    fs.features = [Feature("score", 0.5, "numeric")]
+    assert_lookups_match_scan(fs)
+
+    fs.features.clear()
+    fs.add_feature(Feature("length", 1, "numeric"))
+    assert_lookups_match_scan(fs)
+
+
+def test_features_by_type_returns_a_fresh_list():
+    """Changing a returned list leaves the set's own index alone."""
+    fs = FeatureSet("input", features=[Feature("length", 10, "numeric")])
+
+    fs.get_features_by_type("numeric").clear()
+
+    assert [f.name for f in fs.get_features_by_type("numeric")] == ["length"]
+
+
+def loop_transform(vectorizer: FeatureVectorizer, feature_sets):
+    """The original per-feature transform loop."""
+    vectors = []
+    for fs in feature_sets:
+        vector = np.zeros(len(vectorizer.feature_vocab))
+        for feature in fs.features:
+            if feature.name in vectorizer.feature_vocab and feature.feature_type == "numeric":
+                idx = vectorizer.feature_vocab[feature.name]
+                vector[idx] = float(feature.value)
+        vectors.append(vector)
+    return np.array(vectors)
+
+
+def test_transform_matches_original_loop():
+    """Duplicate, missing, unfitted and non-numeric features transform as before."""
+    fit_sets = [
+        FeatureSet("a", features=[Feature("length", 3, "numeric"), Feature("words", 1, "numeric")]),
+        FeatureSet("b", features=[Feature("score", 0.5, "numeric"), Feature("lang", "en", "categorical")]),
+    ]
+    vectorizer = FeatureVectorizer()
+    vectorizer.fit(fit_sets)
+
+    duplicates = FeatureSet("dup", features=[
+        Feature("length", 1, "numeric"),
+        Feature("score", 0.25, "numeric"),
+        Feature("length", 2, "numeric"),
+        Feature("length", True, "numeric"),
+        Feature("words", "7.5", "numeric"),
+    ])
+    feature_sets = [
+        *fit_sets,
+        duplicates,
+        # Missing every fitted feature, or carrying ones not seen in fit
+        FeatureSet("empty"),
+        FeatureSet("unseen", features=[Feature("other", 9, "numeric"), Feature("length", 4, "text")]),
+    ]
+
+    transformed = vectorizer.transform(feature_sets)
+
+    np.testing.assert_array_equal(transformed, loop_transform(vectorizer, feature_sets))
+    assert transformed[2].tolist() == [1.0, 0.25, 7.5]
+
+
+def test_transform_rejects_non_numeric_values_like_original_loop():
+    """A value float() can't convert raises ValueError, as it always did."""
+    vectorizer = FeatureVectorizer()
+    vectorizer.fit([FeatureSet("a", features=[Feature("length", 3, "numeric")])])
+
+    with pytest.raises(ValueError):
+        vectorizer.transform([FeatureSet("bad", features=[Feature("length", "long", "numeric")])])
@@ -0,0 +1,71 @@
+"""
+Tests for knowledge base document chunking.
+"""
+
+import random
+import re
+
+import pytest
+
+from discord_bot.cogs.kb_management import KnowledgeBaseCog
+
+
+def reference_chunks(content: str, chunk_size: int = 500) -> list:
+    """The original paragraph-accumulating chunker."""
+    paragraphs = re.split(r'\n\s*\n', content)
+
+    chunks = []
+    current_chunk = []
+    current_size = 0
+
+    for para in paragraphs:
+        para_size = len(para)
+
+        if current_size + para_size > chunk_size and current_chunk:
+            chunks.append('\n\n'.join(current_chunk))
+            current_chunk = [para]
+            current_size = para_size
+        else:
+            current_chunk.append(para)
+            current_size += para_size
+
+    if current_chunk:
+        chunks.append('\n\n'.join(current_chunk))
+
+    return chunks
+
+
+@pytest.fixture
+def cog():
+    return KnowledgeBaseCog(bot=None)
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "one paragraph",
+    "a\n\nb\n\nc",
+    "x" * 501,
+    "x" * 500 + "\n\n" + "y",
+    "x" * 499 + "\n\n" + "y" + "\n\n" + "z",
+    "short\n\n" + "x" * 1200 + "\n\nshort again",
+    "\n\n\n  \n\ntrailing and leading separators\n \t\n",
+    "\n\n",
+])
+def test_chunks_match_original_chunker(cog, content):
+    """Edge cases around the size limit chunk exactly as before."""
+    assert cog._chunk_document(content) == reference_chunks(content)
+
+
+def test_chunks_match_original_chunker_on_random_documents(cog):
+    """Random paragraph layouts and chunk sizes chunk exactly as before."""
+    rng = random.Random(1234)
+    separators = ["\n\n", "\n \n", "\n\t\n\n", "\n\n\n"]
+
+    for _ in range(300):
+        paragraphs = ["p" * rng.choice([0, 1, 5, 50, 200, 499, 500, 501, 900]) for _ in range(rng.randint(1, 15))]
+        content = paragraphs[0]
+        for para in paragraphs[1:]:
+            content += rng.choice(separators) + para
+        chunk_size = rng.choice([1, 10, 100, 500, 1000])
+
+        assert cog._chunk_document(content, chunk_size) == reference_chunks(content, chunk_size)
@@ -0,0 +1,17 @@
+"""
+Tests for ML experiment configuration templates.
+"""
+
+from src.ml_orchestration.config import ConfigManager
+
+
+def test_template_changes_stay_in_their_manager(tmp_path):
+    """Tweaking one manager's template leaves other managers' templates intact."""
+    first = ConfigManager(str(tmp_path / "first"))
+    first.get_template("text_classification").training.num_epochs = 1
+
+    second = ConfigManager(str(tmp_path / "second"))
+
+    assert second.get_template("text_classification").training.num_epochs == 5
+    assert second.create_from_template("text_classification", "run").training.num_epochs == 5
+    assert first.create_from_template("text_classification", "run").training.num_epochs == 1
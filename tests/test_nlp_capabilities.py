@@ -0,0 +1,109 @@
+"""
+Tests for the NLP capability registry.
+"""
+
+import pytest
+
+from src.nlp_capabilities.capabilities import (
+    CAPABILITY_REGISTRY,
+    CapabilityLevel,
+    CompositeCapability,
+    Document,
+    SentenceSplitterCapability,
+    TokenizerCapability,
+    get_capabilities_by_level,
+    get_capability,
+)
+
+
+def test_get_capability_returns_independent_instances():
+    """Configuring or unloading one caller's capability leaves others untouched."""
+    first = get_capability("ner")
+    second = get_capability("ner")
+
+    first.load({"model": "large"})
+    first.configure(threshold=0.9)
+
+    assert first is not second
+    assert second.config == {}
+    assert not second.is_loaded
+    assert get_capability("unknown") is None
+
+
+def test_capabilities_by_level_matches_instances():
+    """Level lookups agree with the metadata of freshly built capabilities."""
+    for level in CapabilityLevel:
+        expected = [
+            name for name, capability_class in CAPABILITY_REGISTRY.items()
+            if capability_class().metadata.level == level
+        ]
+        assert get_capabilities_by_level(level) == expected
+
+
+SAMPLE_TEXTS = [
+    "John Smith emailed jane.doe@example.com about the launch. It went great!",
+    "  leading and trailing   whitespace\tand\ttabs\n\nnew lines...  ",
+    "Repeated repeated repeated tokens. Repeated? Yes!!",
+    "",
+]
+
+
+def apply_stages_one_by_one(names, doc: Document) -> Document:
+    """The demo's original loop over separately fetched capabilities."""
+    for name in names:
+        capability = get_capability(name)
+        if capability and capability.can_process(doc):
+            doc = capability.process(doc)
+    return doc
+
+
+@pytest.mark.parametrize("text", SAMPLE_TEXTS)
+def test_pipeline_matches_applying_stages_one_by_one(text):
+    """A pipeline capability annotates exactly like running its stages in turn."""
+    names = ["tokenizer", "sentence_splitter", "ner", "sentiment_analysis"]
+    pipeline = get_capability("pipeline:" + ", ".join(names))
+
+    expected = apply_stages_one_by_one(names, Document(text=text, id="doc"))
+    actual = Document(text=text, id="doc")
+    assert pipeline.can_process(actual)
+    actual = pipeline.process(actual)
+
+    assert actual.annotations == expected.annotations
+    assert list(actual.annotations) == list(expected.annotations)
+
+
+@pytest.mark.parametrize("text", SAMPLE_TEXTS)
+def test_tokenizer_spans_match_split_and_find(text):
+    """Token spans found in one pass match split() plus find() from the last token."""
+    tokens = text.split()
+    spans = []
+    current_pos = 0
+    for token in tokens:
+        start = text.find(token, current_pos)
+        spans.append((start, start + len(token), token))
+        current_pos = start + len(token)
+
+    doc = get_capability("tokenizer").process(Document(text=text))
+
+    assert doc.get_annotation("tokens") == tokens
+    assert doc.get_annotation("token_spans") == spans
+
+
+def test_pipeline_runs_stages_that_support_the_language():
+    """Like the stage-by-stage loop, stages for other languages are skipped, not the whole pipeline."""
+    french_tokenizer = TokenizerCapability()
+    french_tokenizer.metadata.languages = {"fr"}
+    pipeline = CompositeCapability([french_tokenizer, SentenceSplitterCapability()])
+    doc = Document(text="Bonjour tout le monde.", language="fr")
+
+    assert pipeline.metadata.name == "pipeline:tokenizer,sentence_splitter"
+    assert pipeline.metadata.languages == {"en", "fr"}
+    assert pipeline.can_process(doc)
+    assert list(pipeline.process(doc).annotations) == ["tokens", "token_spans"]
+    assert not pipeline.can_process(Document(text="Hallo", language="de"))
+
+
+def test_unknown_pipeline_stage_gives_no_capability():
+    """A pipeline naming an unknown stage is rejected like an unknown capability."""
+    assert get_capability("pipeline:tokenizer,unknown") is None
+    assert get_capability("pipeline:") is None
@@ -68,5 +68,64 @@ def test_register_decorator():
     assert info.tags.get_tag("supports_async") is True
 
 
+
+def scan_by_tag(registry, tag_name, tag_value):
+    """Names found by scanning every component, as lookups did before the value index."""
+    return sorted(
+        info.name for info in registry.list_all()
+        if info.tags.has_tag(tag_name) and info.tags.get_tag(tag_name) == tag_value
+    )
+
+
+def test_value_index_follows_reregister_and_unregister():
+    """Value lookups agree with a full scan after components change or leave."""
+    registry = ComponentRegistry()
+    
+    class Component:
+        pass
+    
+    registry.register("a", Component, supports_streaming=True, complexity="O(n)")
+    registry.register("b", Component, supports_streaming=True, complexity="O(n^2)")
+    registry.register("c", Component, supports_streaming=False, input_types=["text"])
+    registry.register("d", Component, complexity="O(n)", requires_gpu=True)
+    
+    # Re-registering replaces the old tags, dropping and changing values
+    registry.register("a", Component, supports_streaming=False, requires_gpu=True)
+    registry.register("b", Component, supports_streaming=True, complexity="O(n)")
+    registry.unregister("d")
+    registry.unregister("missing")
+    
+    lookups = [
+        ("supports_streaming", True),
+        ("supports_streaming", False),
+        ("complexity", "O(n)"),
+        ("complexity", "O(n^2)"),
+        ("requires_gpu", True),
+        ("input_types", ["text"]),
+        ("unknown_tag", True),
+    ]
+    for tag_name, tag_value in lookups:
+        found = sorted(info.name for info in registry.find_by_tag(tag_name, tag_value))
+        assert found == scan_by_tag(registry, tag_name, tag_value)
+    
+    assert [info.name for info in registry.find_by_capability("supports_streaming")] == ["b"]
+    assert [info.name for info in registry.find_by_tag("requires_gpu", True)] == ["a"]
+    assert registry.find_by_tag("complexity", "O(n^2)") == []
+    
+    criteria = {"supports_streaming": True, "complexity": "O(n)"}
+    assert [info.name for info in registry.find_by_criteria(criteria)] == ["b"]
+    criteria = {"supports_streaming": False, "input_types": ["text"]}
+    assert [info.name for info in registry.find_by_criteria(criteria)] == ["c"]
+    
+    registry.unregister("b")
+    registry.unregister("c")
+    assert registry.find_by_tag("supports_streaming", True) == []
+    assert registry.find_by_criteria({"complexity": "O(n)"}) == []
+    assert registry._by_value == {
+        ("supports_streaming", False): {"a": None},
+        ("requires_gpu", True): {"a": None},
+    }
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,177 @@
+"""
+Tests for suggestion caching and request coalescing.
+"""
+
+import asyncio
+import gc
+
+from discord_bot.suggestion_engine import SuggestionEngine
+
+
+CONTEXT = [{"command_text": "git add ."}]
+
+
+class FakeDatabase:
+    """Database stub whose pattern lookup can be held open by the test."""
+
+    def __init__(self):
+        self.generation = 0
+        self.pattern_calls = 0
+        self.stored = []
+        self.release = asyncio.Event()
+
+    def history_generation(self, user_id: str) -> int:
+        return self.generation
+
+    async def get_command_patterns(self, user_id: str):
+        self.pattern_calls += 1
+        await self.release.wait()
+        return []
+
+    async def get_command_frequencies(self, user_id: str, window: int, limit: int):
+        return [], 0
+
+    async def search_kb_chunks(self, user_id: str, query: str, limit: int = 5):
+        return []
+
+    async def store_suggestions_bulk(self, user_id: str, context_hash: str, suggestions):
+        self.stored.append(suggestions)
+
+
+def suggest(engine: SuggestionEngine):
+    return engine.generate_suggestions("user", CONTEXT, "git add .")
+
+
+def test_concurrent_identical_requests_share_one_lookup():
+    """Callers arriving while a request runs wait for it instead of repeating it."""
+
+    async def scenario():
+        db = FakeDatabase()
+        engine = SuggestionEngine(db)
+
+        first = asyncio.create_task(suggest(engine))
+        second = asyncio.create_task(suggest(engine))
+        await asyncio.sleep(0)
+        db.release.set()
+        results = await asyncio.gather(first, second)
+        return db, results
+
+    db, (first, second) = asyncio.run(scenario())
+
+    assert db.pattern_calls == 1
+    assert len(db.stored) == 1
+    assert [s["command"] for s in first] == ['git commit -m "Update"', "git status"]
+    assert first == second
+    assert first is not second
+
+
+def test_cancelled_caller_does_not_cancel_shared_request():
+    """One waiter being cancelled leaves the shared work running for the rest."""
+
+    async def scenario():
+        db = FakeDatabase()
+        engine = SuggestionEngine(db)
+
+        cancelled = asyncio.create_task(suggest(engine))
+        waiting = asyncio.create_task(suggest(engine))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.sleep(0)
+        db.release.set()
+        return db, cancelled, await waiting
+
+    db, cancelled, result = asyncio.run(scenario())
+
+    assert cancelled.cancelled()
+    assert db.pattern_calls == 1
+    assert [s["command"] for s in result] == ['git commit -m "Update"', "git status"]
+
+
+def test_results_cached_until_history_changes():
+    """Repeat requests hit the cache until the user's history generation moves."""
+
+    async def scenario():
+        db = FakeDatabase()
+        db.release.set()
+        engine = SuggestionEngine(db)
+
+        await suggest(engine)
+        await suggest(engine)
+        calls_before_change = db.pattern_calls
+
+        db.generation += 1
+        await suggest(engine)
+        return calls_before_change, db.pattern_calls
+
+    calls_before_change, calls_after_change = asyncio.run(scenario())
+
+    assert calls_before_change == 1
+    assert calls_after_change == 2
+
+
+def test_failure_with_all_waiters_cancelled_is_retrieved():
+    """A request that fails after its only waiter gave up is not reported as unhandled."""
+
+    async def scenario():
+        unhandled = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _, context: unhandled.append(context))
+
+        db = FakeDatabase()
+
+        async def failing_patterns(user_id):
+            await db.release.wait()
+            raise RuntimeError("database went away")
+
+        db.get_command_patterns = failing_patterns
+        engine = SuggestionEngine(db)
+
+        waiter = asyncio.create_task(suggest(engine))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.sleep(0)
+        db.release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        del waiter
+        gc.collect()
+        return unhandled, engine._inflight
+
+    unhandled, inflight = asyncio.run(scenario())
+
+    assert unhandled == []
+    assert inflight == {}
+
+
+def test_tied_confidences_keep_first_appearance_order():
+    """Ties rank by each command's first appearance, even one below the threshold."""
+
+    async def scenario():
+        db = FakeDatabase()
+        db.release.set()
+        engine = SuggestionEngine(db)
+
+        async def pattern_suggestions(user_id, context):
+            return [
+                {"command": "make test", "source": "pattern", "confidence": 0.55},
+                {"command": "make lint", "source": "pattern", "confidence": 0.8},
+            ]
+
+        async def frequency_suggestions(user_id, context):
+            return [
+                {"command": "make build", "source": "frequency", "confidence": 0.8},
+                {"command": "make test", "source": "frequency", "confidence": 0.8},
+            ]
+
+        engine._get_pattern_based_suggestions = pattern_suggestions
+        engine._get_frequency_based_suggestions = frequency_suggestions
+        return await engine.generate_suggestions("user", [], "hi")
+
+    suggestions = asyncio.run(scenario())
+
+    assert [(s["command"], s["source"]) for s in suggestions] == [
+        ("make test", "frequency"),
+        ("make lint", "pattern"),
+        ("make build", "frequency"),
+    ]